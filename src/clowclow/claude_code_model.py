@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
@@ -9,12 +10,14 @@ from typing import AsyncIterator, Literal
 
 from pydantic_ai.models import Model, ModelResponse, ModelSettings, StreamedResponse, ModelRequestParameters, RunContext, RequestUsage
 from pydantic_ai import messages as _messages
+from pydantic_ai.tools import ToolDefinition
 from pydantic_ai._parts_manager import ModelResponsePartsManager
 
 from .claude_client import CustomClaudeCodeClient
 from .request_handler import RequestHandler
 from .dynamic_model_builder import DynamicModelBuilder
 from .constants import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DEFAULT_TOOL_CALL_ID,
     STRUCTURED_QUERY_CUSTOM_INSTRUCTIONS,
     STRUCTURED_QUERY_WITH_TOOLS_INSTRUCTIONS,
@@ -30,7 +33,8 @@ class ClaudeCodeModel(Model):
         api_key: str | None = None,
         model_name: str = "claude-code",
         workspace_dir: Path | None = None,
-        model: str | None = None
+        model: str | None = None,
+        history_limit: int | None = None
     ) -> None:
         """Initialize the Claude Code model.
 
@@ -39,8 +43,14 @@ class ClaudeCodeModel(Model):
             model_name: Model identifier, defaults to "claude-code"
             workspace_dir: Working directory for temporary files
             model: Anthropic model to use (e.g., "claude-3-5-sonnet-20241022"). If not provided, uses SDK default.
+            history_limit: Maximum number of previous messages sent along with each request in
+                multi-turn conversations, keeping the most recent ones. If not provided, the
+                whole history is sent. Once the limit is reached, every turn drops the oldest
+                message, so the prompt prefix changes each request and prompt caching no
+                longer applies to the history.
         """
         self._model_name = model_name
+        self._history_limit = history_limit
         self._client = CustomClaudeCodeClient(api_key=api_key, workspace_dir=workspace_dir, model=model)
 
     @property
@@ -89,19 +99,12 @@ class ClaudeCodeModel(Model):
         """
         try:
             # Extract messages using RequestHandler
-            has_images = RequestHandler.has_images(messages)
-            user_content = (
-                RequestHandler.extract_multimodal_content(messages)
-                if has_images
-                else RequestHandler.extract_user_message(messages)
-            )
+            user_content = RequestHandler.extract_content(messages, history_limit=self._history_limit)
             system_prompt = RequestHandler.extract_system_messages(messages)
 
             # Check for function tools (user-defined tools that Claude can call)
             text_from_tools = None
-            if (model_request_parameters and
-                hasattr(model_request_parameters, 'function_tools') and
-                model_request_parameters.function_tools):
+            if model_request_parameters is not None and model_request_parameters.function_tools:
 
                 # Check if this is a continuation with tool results
                 tool_returns = RequestHandler.check_for_tool_returns(messages)
@@ -133,41 +136,16 @@ class ClaudeCodeModel(Model):
                     text_from_tools = result['text']
 
             # Check if this is a structured output request (tool mode)
-            if (model_request_parameters and
-                hasattr(model_request_parameters, 'output_mode') and
+            if (model_request_parameters is not None and
                 model_request_parameters.output_mode == 'tool' and
                 model_request_parameters.output_tools):
 
-                # Extract the JSON schema from the output tool
-                output_tool = model_request_parameters.output_tools[0]
-                schema_dict = output_tool.parameters_json_schema
-                tool_name = output_tool.name
-
-                # Create dynamic model from schema
-                DynamicModel = DynamicModelBuilder.create_model_from_schema(schema_dict)
-
-                # Determine message and instructions based on context
-                if text_from_tools:
-                    # We have text from tools query, use it to extract structured data
-                    structured_message = self._create_structured_message_from_tools(
-                        user_content, text_from_tools
-                    )
-                    custom_instructions = STRUCTURED_QUERY_WITH_TOOLS_INSTRUCTIONS
-                else:
-                    structured_message = user_content
-                    custom_instructions = STRUCTURED_QUERY_CUSTOM_INSTRUCTIONS
-
-                # Execute structured query
-                structured_response = await self._client.structured_query(
-                    message=structured_message,
-                    pydantic_class=DynamicModel,
-                    system_prompt=system_prompt,
-                    custom_instructions=custom_instructions
-                )
-
-                # Post-process and convert to tool call
-                args = DynamicModelBuilder.post_process_model_data(
-                    structured_response.model_dump(), schema_dict
+                tool_name, args = await self._structured_call(
+                    user_content,
+                    system_prompt,
+                    model_request_parameters.output_tools[0],
+                    text_from_tools,
+                    tools_instructions=STRUCTURED_QUERY_WITH_TOOLS_INSTRUCTIONS
                 )
 
                 tool_call = _messages.ToolCallPart(
@@ -188,6 +166,97 @@ class ClaudeCodeModel(Model):
         except Exception as e:
             raise RuntimeError(f"Claude Code request failed: {e}") from e
 
+    async def request_many(
+        self,
+        requests: list[tuple[list[_messages.ModelMessage], ModelSettings | None, ModelRequestParameters]],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS
+    ) -> list[ModelResponse]:
+        """Make several independent requests concurrently.
+
+        Each request runs in its own Claude Code session, so their round trips
+        can overlap; max_concurrency bounds how many run at once. If any request
+        fails, the others are cancelled rather than left running.
+
+        Args:
+            requests: (messages, model_settings, model_request_parameters) for each request
+            max_concurrency: Maximum number of requests in flight at the same time
+
+        Returns:
+            The model responses, in the same order as the requests
+
+        Raises:
+            RuntimeError: The first request failure, as raised by request()
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(
+            messages: list[_messages.ModelMessage],
+            model_settings: ModelSettings | None,
+            model_request_parameters: ModelRequestParameters
+        ) -> ModelResponse:
+            async with semaphore:
+                return await self.request(messages, model_settings, model_request_parameters)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(run(*request)) for request in requests]
+        except ExceptionGroup as errors:
+            # Surface the first failure like a single request() would
+            raise errors.exceptions[0] from None
+        return [task.result() for task in tasks]
+
+    async def _structured_call(
+        self,
+        user_content: str | list[dict],
+        system_prompt: str,
+        output_tool: ToolDefinition,
+        text_from_tools: str | None,
+        tools_instructions: str
+    ) -> tuple[str, dict]:
+        """Run a structured query for an output tool and build its call arguments.
+
+        Args:
+            user_content: User content (str or list of content blocks)
+            system_prompt: System prompt for the query
+            output_tool: Output tool whose parameters schema defines the result
+            text_from_tools: Text from a preceding tools query, if any
+            tools_instructions: Custom instructions to use when text_from_tools is set
+
+        Returns:
+            Tuple of (tool name, tool call arguments)
+        """
+        # Create dynamic model from the output tool's JSON schema
+        DynamicModel, list_fields, dict_fields = (
+            DynamicModelBuilder.create_model_with_container_fields(output_tool.parameters_json_schema)
+        )
+
+        # Determine message and instructions based on context
+        if text_from_tools:
+            # We have text from tools query, use it to extract structured data
+            structured_message = self._create_structured_message_from_tools(
+                user_content, text_from_tools
+            )
+            custom_instructions = tools_instructions
+        else:
+            structured_message = user_content
+            custom_instructions = STRUCTURED_QUERY_CUSTOM_INSTRUCTIONS
+
+        # Execute structured query
+        structured_response = await self._client.structured_query(
+            message=structured_message,
+            pydantic_class=DynamicModel,
+            system_prompt=system_prompt,
+            custom_instructions=custom_instructions
+        )
+
+        # Post-process into tool call arguments. Dynamic models only hold plain
+        # values (never nested models), so the validated field dict is already
+        # what model_dump() returns
+        args = DynamicModelBuilder.fill_empty_containers(
+            structured_response.__dict__, list_fields, dict_fields
+        )
+        return output_tool.name, args
+
     @staticmethod
     def _create_structured_message_from_tools(
         user_content: str | list[dict],
@@ -293,19 +362,14 @@ class ClaudeCodeStreamedResponse(StreamedResponse):
 
         try:
             # Extract messages using RequestHandler
-            has_images = RequestHandler.has_images(self._messages)
-            user_content = (
-                RequestHandler.extract_multimodal_content(self._messages)
-                if has_images
-                else RequestHandler.extract_user_message(self._messages)
+            user_content = RequestHandler.extract_content(
+                self._messages, history_limit=self._model._history_limit
             )
             system_message = RequestHandler.extract_system_messages(self._messages)
 
             # Check for function tools
             text_from_tools = None
-            if (self._model_request_parameters and
-                hasattr(self._model_request_parameters, 'function_tools') and
-                self._model_request_parameters.function_tools):
+            if self._model_request_parameters is not None and self._model_request_parameters.function_tools:
 
                 # Check for tool results
                 tool_returns = RequestHandler.check_for_tool_returns(self._messages)
@@ -338,39 +402,16 @@ class ClaudeCodeStreamedResponse(StreamedResponse):
                     text_from_tools = result['text']
 
             # Check if this is a structured output request
-            if (self._model_request_parameters and
-                hasattr(self._model_request_parameters, 'output_mode') and
+            if (self._model_request_parameters is not None and
                 self._model_request_parameters.output_mode == 'tool' and
                 self._model_request_parameters.output_tools):
 
-                # Extract schema and create dynamic model
-                output_tool = self._model_request_parameters.output_tools[0]
-                schema_dict = output_tool.parameters_json_schema
-                tool_name = output_tool.name
-
-                DynamicModel = DynamicModelBuilder.create_model_from_schema(schema_dict)
-
-                # Determine message and instructions
-                if text_from_tools:
-                    structured_message = self._model._create_structured_message_from_tools(
-                        user_content, text_from_tools
-                    )
-                    custom_instructions = STRUCTURED_QUERY_FROM_RESPONSE_INSTRUCTIONS
-                else:
-                    structured_message = user_content
-                    custom_instructions = STRUCTURED_QUERY_CUSTOM_INSTRUCTIONS
-
-                # Execute structured query
-                structured_response = await self._model._client.structured_query(
-                    message=structured_message,
-                    pydantic_class=DynamicModel,
-                    system_prompt=system_message,
-                    custom_instructions=custom_instructions
-                )
-
-                # Post-process and yield tool call
-                args = DynamicModelBuilder.post_process_model_data(
-                    structured_response.model_dump(), schema_dict
+                tool_name, args = await self._model._structured_call(
+                    user_content,
+                    system_message,
+                    self._model_request_parameters.output_tools[0],
+                    text_from_tools,
+                    tools_instructions=STRUCTURED_QUERY_FROM_RESPONSE_INSTRUCTIONS
                 )
 
                 yield self._parts_manager.handle_tool_call_part(
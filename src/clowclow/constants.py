@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import tempfile
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
@@ -31,6 +32,24 @@ STRUCTURED_OUTPUT_INSTRUCTIONS = """IMPORTANT: Respond with ONLY valid JSON that
 - For fields with "pattern", ensure the value EXACTLY matches the regex pattern (e.g., "^[A-F]$" means a single letter A-F)
 - For fields with "minimum"/"maximum", ensure the value is within the specified range"""
 
+# Prompt templates for structured queries, filled with str.format_map.
+# The instruction constants above are spliced in once here (they contain no braces).
+STRUCTURED_PROMPT_TEMPLATE = """<schema>
+{schema_json}
+</schema>
+
+{user_prompt}
+
+{custom_instructions}
+
+""" + STRUCTURED_OUTPUT_INSTRUCTIONS
+
+STRUCTURED_SYSTEM_PROMPT_TEMPLATE = """{system_prompt}
+
+""" + DEFAULT_STRUCTURED_SYSTEM_SUFFIX + """
+
+IMPORTANT: Answer directly based on your knowledge without using any tools or search capabilities. Provide only the JSON response."""
+
 # Custom instructions for structured queries
 STRUCTURED_QUERY_CUSTOM_INSTRUCTIONS = "Generate JSON that exactly matches the required schema. For list/array fields, use empty array [] instead of null if there are no items."
 STRUCTURED_QUERY_WITH_TOOLS_INSTRUCTIONS = "Generate JSON that exactly matches the required schema based on the information provided from the tools. For list/array fields, use empty array [] instead of null if there are no items."
@@ -48,6 +67,9 @@ DEFAULT_MAX_TURNS_TOOLS = 5
 # Tool call ID
 DEFAULT_TOOL_CALL_ID = "tool_call_1"
 
+# Concurrency limit for ClaudeCodeModel.request_many (each request runs its own CLI process)
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
 
 @dataclass
 class ClaudeCodeConfig:
@@ -71,9 +93,12 @@ class ClaudeCodeConfig:
     permission_mode_structured: str = PERMISSION_MODE_ACCEPT_EDITS
     permission_mode_tools: str = PERMISSION_MODE_BYPASS
 
+    # String form of workspace_dir, passed as `cwd` on every query
+    workspace_cwd: str = field(init=False, repr=False)
+
     def __post_init__(self):
         """Initialize workspace directory."""
         if self.workspace_dir is None:
-            import tempfile
             self.workspace_dir = Path(tempfile.gettempdir())
         self.workspace_dir.mkdir(exist_ok=True)
+        self.workspace_cwd = str(self.workspace_dir)
@@ -2,12 +2,39 @@
 
 from __future__ import annotations
 
+import functools
+import json
 from typing import Type, TypeVar, Any
 from pydantic import BaseModel, create_model
 
 
 T = TypeVar('T', bound=BaseModel)
 
+# JSON schema types that map directly onto a Python type
+_SIMPLE_TYPES: dict[str, type] = {
+    'string': str,
+    'integer': int,
+    'number': float,
+    'boolean': bool,
+}
+
+# Prebuilt `T | None` unions for the common field types
+_OPTIONAL_TYPES: dict[Any, Any] = {tp: tp | None for tp in (str, int, float, bool, dict, list)}
+
+
+def _has_ref(schema: dict) -> bool:
+    """Check whether a schema contains a $ref anywhere."""
+    stack: list[Any] = [schema]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if '$ref' in node:
+                return True
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return False
+
 
 class DynamicModelBuilder:
     """Builds dynamic Pydantic models from JSON schemas."""
@@ -24,8 +51,21 @@ class DynamicModelBuilder:
         Returns:
             Schema with all $ref references resolved and inlined
         """
+        # A flat model's schema has no $defs; unless it still holds a ref
+        # elsewhere (e.g. '#/definitions/X'), there is nothing to resolve
+        if '$defs' not in schema and not _has_ref(schema):
+            return schema
+
+        defs = schema.get('$defs', {})
+
         def resolve_ref(ref_path: str, root_schema: dict) -> dict:
             """Resolve a $ref path like '#/$defs/Address' to its definition."""
+            # Fast path: the '#/$defs/<Name>' form Pydantic emits is a single lookup
+            if ref_path.startswith('#/$defs/'):
+                name = ref_path[8:]
+                if '/' not in name:
+                    return defs[name]
+
             if not ref_path.startswith('#/'):
                 raise ValueError(f"Only local refs supported, got: {ref_path}")
 
@@ -35,24 +75,78 @@ class DynamicModelBuilder:
                 current = current[part]
             return current
 
-        def resolve_object(obj: dict, root_schema: dict) -> dict:
-            """Recursively resolve all $ref in an object."""
-            if isinstance(obj, dict):
-                if '$ref' in obj:
-                    # Replace the $ref with the actual definition
-                    ref_def = resolve_ref(obj['$ref'], root_schema)
-                    # Recursively resolve the referenced definition
-                    return resolve_object(ref_def, root_schema)
-                else:
-                    # Recursively resolve nested objects
-                    return {k: resolve_object(v, root_schema) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [resolve_object(item, root_schema) for item in obj]
+        # Pre-pass: record which containers have a $ref somewhere beneath them,
+        # so ref-free subtrees can be reused as-is instead of copied.
+        contains_ref: dict[int, bool] = {}
+        scan: list[tuple[Any, bool]] = [(schema, False)]
+        while scan:
+            node, children_done = scan.pop()
+            children = node.values() if isinstance(node, dict) else node
+            if children_done:
+                contains_ref[id(node)] = (isinstance(node, dict) and '$ref' in node) or any(
+                    contains_ref[id(child)] for child in children if isinstance(child, (dict, list))
+                )
+            else:
+                scan.append((node, True))
+                scan.extend((child, False) for child in children if isinstance(child, (dict, list)))
+
+        # Walk the schema with an explicit work stack instead of recursion.
+        # Each entry is (container, key, node, active_refs, pending_refs): the
+        # resolved form of `node` is written back into `container[key]`,
+        # `active_refs` tracks the $ref chain leading to it so self-referencing
+        # schemas fail fast, and `pending_refs` are the refs that resolve to
+        # `node` and should be memoized once its resolved form exists.
+        # The resolved schema is only read, so subtrees are shared freely.
+        resolved_cache: dict[str, Any] = {}
+        root: dict = {}
+        stack: list[tuple[dict | list, Any, Any, tuple[str, ...], tuple[str, ...]]] = [
+            (root, 'schema', schema, (), ())
+        ]
+
+        while stack:
+            container, key, node, active_refs, pending_refs = stack.pop()
+
+            if isinstance(node, dict) and '$ref' in node:
+                ref_path = node['$ref']
+                if ref_path in active_refs:
+                    raise ValueError(f"Recursive $ref not supported: {ref_path}")
+
+                # Each definition is resolved once; later uses share the result
+                if ref_path in resolved_cache:
+                    cached = resolved_cache[ref_path]
+                    container[key] = cached
+                    for pending in pending_refs:
+                        resolved_cache[pending] = cached
+                    continue
+
+                # Replace the $ref with the actual definition and resolve it in turn
+                ref_def = resolve_ref(ref_path, schema)
+                stack.append((
+                    container, key, ref_def,
+                    active_refs + (ref_path,), pending_refs + (ref_path,)
+                ))
+                continue
+
+            if not isinstance(node, (dict, list)) or not contains_ref[id(node)]:
+                # Scalars and ref-free subtrees are kept as-is
+                resolved_node = node
+            elif isinstance(node, dict):
+                resolved_node = dict(node)
+                for k, v in node.items():
+                    # Top-level $defs are dropped below, so don't resolve them
+                    if isinstance(v, (dict, list)) and not (node is schema and k == '$defs'):
+                        stack.append((resolved_node, k, v, active_refs, ()))
             else:
-                return obj
+                resolved_node = list(node)
+                for i, item in enumerate(node):
+                    if isinstance(item, (dict, list)):
+                        stack.append((resolved_node, i, item, active_refs, ()))
 
-        # Create a copy and resolve all refs
-        resolved = resolve_object(schema, schema)
+            container[key] = resolved_node
+            for pending in pending_refs:
+                resolved_cache[pending] = resolved_node
+
+        resolved = root['schema']
 
         # Remove $defs from the final schema since everything is inlined
         if isinstance(resolved, dict) and '$defs' in resolved:
@@ -77,28 +171,30 @@ class DynamicModelBuilder:
 
         # Handle anyOf (union types, including optional fields with None)
         if 'anyOf' in field_schema:
-            any_of = field_schema['anyOf']
-            # Check if this is an optional field (union with null)
-            has_null = any(item.get('type') == 'null' for item in any_of)
-            # Get the non-null type
-            non_null_types = [item for item in any_of if item.get('type') != 'null']
-            if non_null_types:
-                base_type = DynamicModelBuilder.get_type_from_schema(non_null_types[0])
+            # Check if this is an optional field (union with null) and get the
+            # first non-null type in the same pass
+            has_null = False
+            first_non_null = None
+            for item in field_schema['anyOf']:
+                if item.get('type') == 'null':
+                    has_null = True
+                elif first_non_null is None:
+                    first_non_null = item
+            if first_non_null is not None:
+                base_type = DynamicModelBuilder.get_type_from_schema(first_non_null)
                 if has_null:
-                    return base_type | None
+                    return DynamicModelBuilder._optional(base_type)
                 return base_type
             return str  # Fallback
 
         schema_type = field_schema.get('type', 'string')
-
-        if schema_type == 'string':
+        if not isinstance(schema_type, str):
+            # e.g. a list of types - fall back like any other unknown type
             return str
-        elif schema_type == 'integer':
-            return int
-        elif schema_type == 'number':
-            return float
-        elif schema_type == 'boolean':
-            return bool
+
+        simple_type = _SIMPLE_TYPES.get(schema_type)
+        if simple_type is not None:
+            return simple_type
         elif schema_type == 'array':
             # Handle arrays like list[str], list[int], etc.
             items_schema = field_schema.get('items', {})
@@ -117,22 +213,66 @@ class DynamicModelBuilder:
             # Default fallback
             return str
 
+    @staticmethod
+    def _optional(field_type: Any) -> Any:
+        """Get `field_type | None`, reusing the prebuilt union for common types."""
+        optional_type = _OPTIONAL_TYPES.get(field_type)
+        if optional_type is None:
+            optional_type = field_type | None
+        return optional_type
+
     @staticmethod
     def create_model_from_schema(schema_dict: dict) -> Type[BaseModel]:
         """Create a dynamic Pydantic model from a JSON schema.
 
+        Models are cached per schema, so repeated requests with the same output
+        schema reuse the already-built model and its validator.
+
         Args:
             schema_dict: JSON schema dictionary
 
         Returns:
             Dynamically created Pydantic model class
         """
+        return DynamicModelBuilder.create_model_with_container_fields(schema_dict)[0]
+
+    @staticmethod
+    def create_model_with_container_fields(
+        schema_dict: dict
+    ) -> tuple[Type[BaseModel], tuple[str, ...], tuple[str, ...]]:
+        """Create a dynamic model along with its array and object field names.
+
+        The field names are collected in the same pass that builds the model and
+        cached with it, so post-processing doesn't walk the schema again.
+
+        Args:
+            schema_dict: JSON schema dictionary
+
+        Returns:
+            Tuple of (model class, array field names, object field names)
+        """
+        # Dicts aren't hashable, so key the cache on the serialized schema.
+        # Key order is kept (no sort_keys) since it determines field order.
+        return _create_model_cached(json.dumps(schema_dict))
+
+    @staticmethod
+    def _build_model(
+        schema_dict: dict
+    ) -> tuple[Type[BaseModel], tuple[str, ...], tuple[str, ...]]:
+        """Build a new dynamic model and its container field names (uncached)."""
         fields = {}
+        list_fields = []
+        dict_fields = []
         properties = schema_dict.get('properties', {})
         required = schema_dict.get('required', [])
 
         for field_name, field_schema in properties.items():
             field_type = DynamicModelBuilder.get_type_from_schema(field_schema)
+            schema_type = field_schema.get('type')
+            if schema_type == 'array':
+                list_fields.append(field_name)
+            elif schema_type == 'object':
+                dict_fields.append(field_name)
 
             # Make field optional if not required
             if field_name not in required:
@@ -141,15 +281,15 @@ class DynamicModelBuilder:
                     # Use the default value from the schema
                     fields[field_name] = (field_type, field_schema['default'])
                 # Provide default values for optional fields without explicit defaults
-                elif field_schema.get('type') == 'array':
+                elif schema_type == 'array':
                     fields[field_name] = (field_type, [])
-                elif field_schema.get('type') == 'object':
+                elif schema_type == 'object':
                     fields[field_name] = (field_type, {})
                 else:
                     # Only add | None if the type doesn't already include None
                     # (anyOf with null already returns type | None)
                     if not ('anyOf' in field_schema):
-                        field_type = field_type | None
+                        field_type = DynamicModelBuilder._optional(field_type)
                     fields[field_name] = (field_type, None)
             else:
                 # Required field - check if it has a default (shouldn't normally, but handle it)
@@ -160,7 +300,7 @@ class DynamicModelBuilder:
 
         # Create the dynamic model
         model_name = schema_dict.get('title', 'OutputModel')
-        return create_model(model_name, **fields)
+        return create_model(model_name, **fields), tuple(list_fields), tuple(dict_fields)
 
     @staticmethod
     def post_process_model_data(model_data: dict, schema_dict: dict) -> dict:
@@ -174,12 +314,44 @@ class DynamicModelBuilder:
             Post-processed model data
         """
         properties = schema_dict.get('properties', {})
-        result = model_data.copy()
+        return DynamicModelBuilder.fill_empty_containers(
+            model_data,
+            tuple(name for name, field in properties.items() if field.get('type') == 'array'),
+            tuple(name for name, field in properties.items() if field.get('type') == 'object')
+        )
 
-        for field_name, field_schema in properties.items():
-            if field_schema.get('type') == 'array' and result.get(field_name) is None:
+    @staticmethod
+    def fill_empty_containers(
+        model_data: dict,
+        list_fields: tuple[str, ...],
+        dict_fields: tuple[str, ...]
+    ) -> dict:
+        """Replace None values with [] or {} for known array and object fields.
+
+        Takes the field names returned by create_model_with_container_fields,
+        so the schema isn't read again.
+
+        Args:
+            model_data: Model data dictionary
+            list_fields: Names of array fields
+            dict_fields: Names of object fields
+
+        Returns:
+            Post-processed model data
+        """
+        result = model_data.copy()
+        for field_name in list_fields:
+            if result.get(field_name) is None:
                 result[field_name] = []
-            elif field_schema.get('type') == 'object' and result.get(field_name) is None:
+        for field_name in dict_fields:
+            if result.get(field_name) is None:
                 result[field_name] = {}
-
         return result
+
+
+@functools.lru_cache(maxsize=256)
+def _create_model_cached(
+    schema_json: str
+) -> tuple[Type[BaseModel], tuple[str, ...], tuple[str, ...]]:
+    """Build the dynamic model for a serialized schema once and reuse it."""
+    return DynamicModelBuilder._build_model(json.loads(schema_json))
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import itertools
 import os
-import time
 import warnings
 from pathlib import Path
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
+
+
+# Per-process counter for unique temp image filenames
+_image_counter = itertools.count()
 
 
 class MultimodalContentHandler:
@@ -21,6 +26,8 @@ class MultimodalContentHandler:
         """
         self.workspace_dir = workspace_dir
         self.workspace_dir.mkdir(exist_ok=True)
+        # Resolved once so temp file paths are absolute without per-image work
+        self._workspace_abs = self.workspace_dir.absolute()
 
     def process_content_blocks(self, message: str | list[dict]) -> tuple[str, list[str]]:
         """Process message content blocks, converting images to temp files.
@@ -34,9 +41,58 @@ class MultimodalContentHandler:
         if isinstance(message, str):
             return message, []
 
-        # Handle list of content blocks (multimodal)
-        prompt_parts = []
+        prompt_parts, image_slots = self._plan_content_blocks(message)
+
         temp_files = []
+        try:
+            for _, block in image_slots:
+                temp_files.append(self._save_image_to_file(block))
+        except BaseException:
+            self.cleanup_files(temp_files)
+            raise
+
+        return self._build_prompt(prompt_parts, image_slots, temp_files), temp_files
+
+    async def process_content_blocks_async(self, message: str | list[dict]) -> tuple[str, list[str]]:
+        """Process message content blocks, writing images to temp files concurrently.
+
+        Args:
+            message: Either a string message or list of content blocks
+
+        Returns:
+            Tuple of (final_prompt, temp_file_paths)
+        """
+        if isinstance(message, str):
+            return message, []
+
+        prompt_parts, image_slots = self._plan_content_blocks(message)
+
+        # Decode and write each image in a worker thread so they overlap
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._save_image_to_file, block) for _, block in image_slots),
+            return_exceptions=True
+        )
+        temp_files = [r for r in results if isinstance(r, str)]
+        for result in results:
+            if isinstance(result, BaseException):
+                self.cleanup_files(temp_files)
+                raise result
+
+        return self._build_prompt(prompt_parts, image_slots, temp_files), temp_files
+
+    @staticmethod
+    def _plan_content_blocks(message: list[dict]) -> tuple[list[str | None], list[tuple[int, dict]]]:
+        """Split content blocks into prompt text and base64 images still to be written.
+
+        Args:
+            message: List of content blocks
+
+        Returns:
+            Tuple of (prompt_parts, image_slots) where each image slot is
+            (index into prompt_parts, image block) and that part is a None placeholder
+        """
+        prompt_parts: list[str | None] = []
+        image_slots: list[tuple[int, dict]] = []
 
         for block in message:
             if block.get("type") == "text":
@@ -52,16 +108,32 @@ class MultimodalContentHandler:
                     )
                     # No temp file for URLs
                 else:
-                    # Handle base64 images - save to temp file
-                    temp_file = self._save_image_to_file(block)
-                    if temp_file:  # Only add if we got a file path
-                        temp_files.append(temp_file)
-                        prompt_parts.append(
-                            f"Please read and analyze the image file at this exact path: {Path(temp_file).absolute()}"
-                        )
+                    # Handle base64 images - saved to a temp file later
+                    image_slots.append((len(prompt_parts), block))
+                    prompt_parts.append(None)
+
+        return prompt_parts, image_slots
+
+    @staticmethod
+    def _build_prompt(
+        prompt_parts: list[str | None],
+        image_slots: list[tuple[int, dict]],
+        temp_files: list[str]
+    ) -> str:
+        """Fill image placeholders with their temp file paths and join the prompt.
+
+        Args:
+            prompt_parts: Prompt parts with None placeholders for images
+            image_slots: Image slots returned by _plan_content_blocks
+            temp_files: Temp file path for each image slot, in the same order
+
+        Returns:
+            Final prompt text
+        """
+        for (slot, _), temp_file in zip(image_slots, temp_files):
+            prompt_parts[slot] = f"Please read and analyze the image file at this exact path: {temp_file}"
 
-        final_prompt = "\n\n".join(prompt_parts)
-        return final_prompt, temp_files
+        return "\n\n".join(prompt_parts)
 
     def _save_image_to_file(self, image_block: dict) -> str | None:
         """Save an image block to a temporary file or return None for URLs.
@@ -86,16 +158,20 @@ class MultimodalContentHandler:
             media_type = source.get("media_type", "image/png")
             ext = media_type.split("/")[-1]
 
-            # Create temp file with descriptive name
-            timestamp = int(time.time() * 1000)
-            temp_filename = f"vision_input_{timestamp}.{ext}"
-            temp_filepath = self.workspace_dir / temp_filename
+            # Create temp file with descriptive name; pid + counter can't collide,
+            # even for images written concurrently
+            temp_filename = f"vision_input_{os.getpid()}_{next(_image_counter)}.{ext}"
+            temp_filepath = self._workspace_abs / temp_filename
 
-            # Write image data with explicit flush and sync
-            with open(temp_filepath, 'wb') as f:
-                f.write(image_data)
-                f.flush()
-                os.fsync(f.fileno())
+            # Write image data straight to the fd, skipping Python's buffered IO;
+            # the reader is a local process, so no fsync is needed for visibility
+            fd = os.open(temp_filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                view = memoryview(image_data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
 
             # Verify file was written correctly
             if not temp_filepath.exists():
@@ -140,3 +216,28 @@ class MultimodalContentHandler:
             yield prompt, temp_files
         finally:
             self.cleanup_files(temp_files)
+
+    @asynccontextmanager
+    async def managed_content_async(self, message: str | list[dict]):
+        """Async context manager for automatic cleanup of temporary files.
+
+        Images are written concurrently via process_content_blocks_async. On
+        success the temp files are removed in a background thread so the
+        caller gets its response without waiting on unlink syscalls; on error
+        they are removed before the exception propagates.
+
+        Args:
+            message: Message content to process
+
+        Yields:
+            Tuple of (processed_prompt, temp_file_paths)
+        """
+        prompt, temp_files = await self.process_content_blocks_async(message)
+        try:
+            yield prompt, temp_files
+        except BaseException:
+            self.cleanup_files(temp_files)
+            raise
+
+        if temp_files:
+            asyncio.get_running_loop().run_in_executor(None, self.cleanup_files, list(temp_files))
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import re
 from abc import ABC, abstractmethod
 from typing import Type, TypeVar, Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from claude_agent_sdk import (
     ClaudeSDKClient,
     ClaudeAgentOptions,
@@ -17,10 +18,8 @@ from claude_agent_sdk import (
 )
 
 from .constants import (
-    DEFAULT_SYSTEM_PROMPT,
-    DEFAULT_STRUCTURED_SYSTEM_SUFFIX,
-    STRUCTURED_OUTPUT_INSTRUCTIONS,
-    STRUCTURED_QUERY_CUSTOM_INSTRUCTIONS,
+    STRUCTURED_PROMPT_TEMPLATE,
+    STRUCTURED_SYSTEM_PROMPT_TEMPLATE,
     MCP_TOOL_PREFIX,
     MCP_SERVER_NAME,
     MCP_SERVER_VERSION,
@@ -32,6 +31,30 @@ from .dynamic_model_builder import DynamicModelBuilder
 
 T = TypeVar('T', bound=BaseModel)
 
+# Matches a JSON object wrapped in a ``` or ```json fence
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
+# Shared decoder for locating JSON objects embedded in response text
+_JSON_DECODER = json.JSONDecoder()
+
+
+@functools.lru_cache(maxsize=256)
+def _schema_json_for(pydantic_class: Type[BaseModel]) -> str:
+    """Build the prompt-ready JSON schema for a Pydantic class.
+
+    The result only depends on the class, so it is cached across queries.
+
+    Args:
+        pydantic_class: The Pydantic model class
+
+    Returns:
+        JSON schema with $ref references resolved, serialized for the prompt
+    """
+    schema = pydantic_class.model_json_schema()
+    resolved_schema = DynamicModelBuilder.resolve_schema_refs(schema)
+    # Compact separators: only the model reads this, and whitespace costs tokens
+    return json.dumps(resolved_schema, separators=(',', ':'))
+
 
 class QueryStrategy(ABC):
     """Abstract base class for query strategies."""
@@ -59,6 +82,29 @@ class QueryStrategy(ABC):
         """
         pass
 
+    @staticmethod
+    async def _collect_response_text(client: ClaudeSDKClient) -> str:
+        """Collect the text blocks of a streamed Claude response.
+
+        Args:
+            client: Client that has already been sent the query
+
+        Returns:
+            Concatenated text of all response blocks
+        """
+        response_parts: list[str] = []
+        append = response_parts.append
+
+        async for response_message in client.receive_response():
+            content = getattr(response_message, 'content', None)
+            if content:
+                for block in content:
+                    text = getattr(block, 'text', None)
+                    if text is not None:
+                        append(text)
+
+        return ''.join(response_parts)
+
 
 class SimpleQueryStrategy(QueryStrategy):
     """Strategy for simple text queries."""
@@ -79,32 +125,24 @@ class SimpleQueryStrategy(QueryStrategy):
         Returns:
             The response text
         """
-        with self.multimodal_handler.managed_content(message) as (final_prompt, _):
+        async with self.multimodal_handler.managed_content_async(message) as (final_prompt, _):
             # Add instruction to answer directly without using tools
             enhanced_system = (system_prompt or self.config.default_system_prompt) + "\n\nIMPORTANT: Answer directly based on your knowledge. Do not use any tools or search capabilities."
 
             options = ClaudeAgentOptions(
                 system_prompt=enhanced_system,
                 max_turns=max_turns if max_turns is not None else self.config.max_turns_simple,
-                cwd=str(self.config.workspace_dir),
+                cwd=self.config.workspace_cwd,
                 permission_mode=self.config.permission_mode_simple,
                 allowed_tools=[],  # Disable tools for simple text queries
                 model=self.config.model
             )
 
-            response_parts = []
-
             async with ClaudeSDKClient(options=options) as client:
                 await client.query(final_prompt)
+                response_text = await self._collect_response_text(client)
 
-                # Collect the streaming response
-                async for response_message in client.receive_response():
-                    if hasattr(response_message, 'content'):
-                        for block in response_message.content:
-                            if hasattr(block, 'text'):
-                                response_parts.append(block.text)
-
-            return ''.join(response_parts)
+            return response_text
 
 
 class StructuredQueryStrategy(QueryStrategy):
@@ -130,92 +168,100 @@ class StructuredQueryStrategy(QueryStrategy):
         Returns:
             An instance of the provided Pydantic class
         """
-        # Generate JSON schema and resolve $ref references
-        schema = pydantic_class.model_json_schema()
-        resolved_schema = DynamicModelBuilder.resolve_schema_refs(schema)
-        schema_json = json.dumps(resolved_schema, indent=2)
+        # Generate JSON schema with resolved $ref references (cached per class)
+        schema_json = _schema_json_for(pydantic_class)
 
-        with self.multimodal_handler.managed_content(message) as (user_prompt, _):
+        async with self.multimodal_handler.managed_content_async(message) as (user_prompt, _):
             # Create final prompt with schema
-            final_prompt = f"""<schema>
-{schema_json}
-</schema>
-
-{user_prompt}
-
-{custom_instructions if custom_instructions else ''}
-
-{STRUCTURED_OUTPUT_INSTRUCTIONS}"""
+            final_prompt = STRUCTURED_PROMPT_TEMPLATE.format_map({
+                'schema_json': schema_json,
+                'user_prompt': user_prompt,
+                'custom_instructions': custom_instructions or ''
+            })
 
             # Create enhanced system prompt
-            enhanced_system = f"""{system_prompt or self.config.default_system_prompt}
-
-{DEFAULT_STRUCTURED_SYSTEM_SUFFIX}
-
-IMPORTANT: Answer directly based on your knowledge without using any tools or search capabilities. Provide only the JSON response."""
+            enhanced_system = STRUCTURED_SYSTEM_PROMPT_TEMPLATE.format_map({
+                'system_prompt': system_prompt or self.config.default_system_prompt
+            })
 
             options = ClaudeAgentOptions(
                 system_prompt=enhanced_system,
                 max_turns=max_turns if max_turns is not None else self.config.max_turns_structured,
-                cwd=str(self.config.workspace_dir),
+                cwd=self.config.workspace_cwd,
                 permission_mode=self.config.permission_mode_structured,
                 allowed_tools=[],  # Disable tools for structured output
                 model=self.config.model
             )
 
-            response_parts = []
-
             async with ClaudeSDKClient(options=options) as client:
                 await client.query(final_prompt)
+                response_text = await self._collect_response_text(client)
+
+            return self._parse_response(response_text, pydantic_class)
 
-                # Collect the streaming response
-                async for response_message in client.receive_response():
-                    if hasattr(response_message, 'content'):
-                        for block in response_message.content:
-                            if hasattr(block, 'text'):
-                                response_parts.append(block.text)
+    @staticmethod
+    def _parse_response(response_text: str, pydantic_class: Type[T]) -> T:
+        """Extract the JSON object from a response and validate it into the model.
 
-            response_text = ''.join(response_parts).strip()
+        Args:
+            response_text: Raw response text from Claude
+            pydantic_class: The Pydantic model class to validate against
 
-            # Try to extract JSON from the response
-            json_text = self._extract_json_from_response(response_text)
+        Returns:
+            An instance of the provided Pydantic class
+        """
+        json_data = StructuredQueryStrategy._extract_json_from_response(response_text)
 
-            # Parse and validate the JSON
-            json_data = json.loads(json_text)
+        if isinstance(json_data, str):
+            # Validate straight from the JSON text with pydantic-core's parser
+            try:
+                return pydantic_class.model_validate_json(json_data)
+            except ValidationError as e:
+                # The text only looked like a single object; locate it properly
+                if any(error['type'] != 'json_invalid' for error in e.errors()):
+                    raise
+                json_data = StructuredQueryStrategy._decode_json_object(json_data)
 
-            # Validate and return the Pydantic model
-            return pydantic_class.model_validate(json_data)
+        return pydantic_class.model_validate(json_data)
 
     @staticmethod
-    def _extract_json_from_response(response_text: str) -> str:
-        """Extract JSON from response text that might contain extra content."""
-        # First try to find JSON between triple backticks
-        json_pattern = r'```(?:json)?\s*(\{.*?\})\s*```'
-        match = re.search(json_pattern, response_text, re.DOTALL)
+    def _extract_json_from_response(response_text: str) -> str | dict:
+        """Extract JSON from response text that might contain extra content.
+
+        Cases are tried in order of likelihood: a bare JSON response, a fenced
+        ```json block, then the first object embedded in surrounding prose.
+
+        Returns:
+            The JSON text when it can be validated as-is, or the parsed object
+            when it had to be decoded to find where it ends
+        """
+        # Most responses are a bare JSON object since the prompt asks for nothing else
+        text = response_text.strip()
+        if text.startswith('{') and text.endswith('}'):
+            return text
+
+        # Then try to find JSON between triple backticks
+        match = _JSON_FENCE_RE.search(response_text)
         if match:
             return match.group(1)
 
+        return StructuredQueryStrategy._decode_json_object(response_text)
+
+    @staticmethod
+    def _decode_json_object(text: str) -> dict:
+        """Decode the first JSON object embedded in text."""
         # Try to find JSON object boundaries
-        start = response_text.find('{')
+        start = text.find('{')
         if start == -1:
             raise ValueError("No JSON object found in response")
 
-        # Find matching closing brace
-        brace_count = 0
-        end = start
-        for i, char in enumerate(response_text[start:], start):
-            if char == '{':
-                brace_count += 1
-            elif char == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    end = i + 1
-                    break
-
-        if brace_count != 0:
-            raise ValueError("Unmatched braces in JSON response")
+        # Let the C decoder find the matching closing brace (string-aware)
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON object in response: {e}") from e
 
-        return response_text[start:end]
+        return obj
 
 
 class ToolsQueryStrategy(QueryStrategy):
@@ -296,12 +342,12 @@ class ToolsQueryStrategy(QueryStrategy):
         # Prepare allowed tools list
         allowed_tools = [f"{MCP_TOOL_PREFIX}{t['name']}" for t in tools]
 
-        with self.multimodal_handler.managed_content(message) as (final_prompt, _):
+        async with self.multimodal_handler.managed_content_async(message) as (final_prompt, _):
             # Configure options with MCP server and hook
             options = ClaudeAgentOptions(
                 system_prompt=system_prompt or self.config.default_system_prompt,
                 max_turns=max_turns if max_turns is not None else self.config.max_turns_tools,
-                cwd=str(self.config.workspace_dir),
+                cwd=self.config.workspace_cwd,
                 permission_mode=self.config.permission_mode_tools,  # Auto-accept so tools execute and we capture them
                 allowed_tools=["Read", "Write"] + allowed_tools,
                 mcp_servers={MCP_SERVER_NAME: server},
@@ -313,19 +359,11 @@ class ToolsQueryStrategy(QueryStrategy):
                 model=self.config.model
             )
 
-            response_parts = []
-
             async with ClaudeSDKClient(options=options) as client:
                 await client.query(final_prompt)
-
-                # Collect the streaming response
-                async for response_message in client.receive_response():
-                    if hasattr(response_message, 'content'):
-                        for block in response_message.content:
-                            if hasattr(block, 'text'):
-                                response_parts.append(block.text)
+                response_text = await self._collect_response_text(client)
 
             return {
                 'tool_calls': tool_calls_captured,
-                'text': ''.join(response_parts)
+                'text': response_text
             }
@@ -3,51 +3,187 @@
 from __future__ import annotations
 
 import base64
+import functools
+import weakref
 from typing import Any
-from pydantic_ai import messages as _messages
+from pydantic_ai.messages import (
+    BinaryContent,
+    ImageUrl,
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+# Parts that make a request multimodal on their own
+_IMAGE_TYPES = (BinaryContent, ImageUrl)
+
+
+# Base64 encodings of BinaryContent parts, keyed by id(part) with the bytes
+# they were made from. Entries are dropped when their part is garbage collected,
+# so encoded images never outlive the conversation holding them.
+_BASE64_CACHE: dict[int, tuple[bytes, str]] = {}
+
+
+def _encode_base64(binary_content: BinaryContent) -> str:
+    """Base64-encode a part's image bytes, reusing the result when the part is resent.
+
+    Requests built from the same message history pass the same parts again, so
+    caching per part avoids re-encoding (and re-allocating) megabytes each time.
+    """
+    data = binary_content.data
+    key = id(binary_content)
+    cached = _BASE64_CACHE.get(key)
+    if cached is not None and cached[0] is data:
+        return cached[1]
+
+    # base64 output is pure ASCII, which decodes faster than UTF-8
+    encoded = base64.b64encode(data).decode('ascii')
+    if cached is None:
+        weakref.finalize(binary_content, _BASE64_CACHE.pop, key, None)
+    _BASE64_CACHE[key] = (data, encoded)
+    return encoded
 
 
 class RequestHandler:
     """Handles extraction and processing of Pydantic AI request messages."""
 
     @staticmethod
-    def extract_user_message(messages: list[_messages.ModelMessage], include_history: bool = True) -> str:
+    def extract_content(
+        messages: list[ModelMessage],
+        include_history: bool = True,
+        history_limit: int | None = None
+    ) -> str | list[dict]:
+        """Extract the most recent user content as text, or as content blocks if images are present.
+
+        Equivalent to choosing between extract_user_message and
+        extract_multimodal_content with has_images, but the latest request is
+        only scanned once: its text is collected on the way, and the multimodal
+        path is taken as soon as an image (or list content) turns up.
+
+        Args:
+            messages: List of model messages
+            include_history: If True, prepend conversation history from previous turns
+            history_limit: Maximum number of previous messages to include in the history
+                (None for all of them)
+
+        Returns:
+            User message text, or a list of content blocks for multimodal messages
+        """
+        latest_index = None
+        for index in range(len(messages) - 1, -1, -1):
+            if isinstance(messages[index], ModelRequest):
+                latest_index = index
+                break
+        if latest_index is None:
+            return RequestHandler.extract_user_message(messages, include_history, history_limit)
+
+        parts = messages[latest_index].parts
+        user_text = RequestHandler._single_text_part(parts)
+        if user_text is None:
+            user_parts = []
+            for part in parts:
+                if isinstance(part, UserPromptPart):
+                    if isinstance(part.content, list):
+                        return RequestHandler.extract_multimodal_content(messages, include_history, history_limit)
+                    user_parts.append(part.content)
+                elif isinstance(part, TextPart):
+                    user_parts.append(part.content)
+                elif isinstance(part, _IMAGE_TYPES):
+                    return RequestHandler.extract_multimodal_content(messages, include_history, history_limit)
+            user_text = '\n'.join(user_parts)
+
+        # Images in earlier requests also switch the whole request to multimodal
+        if RequestHandler.has_images(messages[:latest_index]):
+            return RequestHandler.extract_multimodal_content(messages, include_history, history_limit)
+
+        history = RequestHandler._history_prefix(messages, include_history, history_limit)
+        return f"{history}{user_text}"
+
+    @staticmethod
+    def extract_user_message(
+        messages: list[ModelMessage],
+        include_history: bool = True,
+        history_limit: int | None = None
+    ) -> str:
         """Extract the most recent user message (text only), optionally with conversation history.
 
         Args:
             messages: List of model messages
             include_history: If True, prepend conversation history from previous turns
+            history_limit: Maximum number of previous messages to include in the history
+                (None for all of them)
 
         Returns:
             Extracted user message text, optionally with conversation history prepended
         """
         # Get conversation history if requested
-        history = ""
-        if include_history and RequestHandler.has_conversation_history(messages):
-            history = RequestHandler.extract_conversation_history(messages)
-            if history:
-                history = f"{history}\n\n"
+        history = RequestHandler._history_prefix(messages, include_history, history_limit)
 
         # Extract most recent user message
         for msg in reversed(messages):
-            if isinstance(msg, _messages.ModelRequest):
+            if isinstance(msg, ModelRequest):
+                user_text = RequestHandler._single_text_part(msg.parts)
+                if user_text is not None:
+                    return f"{history}{user_text}"
+
                 # Extract text from the parts
                 user_parts = []
                 for part in msg.parts:
-                    if isinstance(part, _messages.UserPromptPart):
+                    if isinstance(part, UserPromptPart):
                         user_parts.append(part.content)
-                    elif isinstance(part, _messages.TextPart):
+                    elif isinstance(part, TextPart):
                         user_parts.append(part.content)
                 return f"{history}{'\n'.join(user_parts)}"
         return history  # Return history even if no current user message
 
     @staticmethod
-    def extract_multimodal_content(messages: list[_messages.ModelMessage], include_history: bool = True) -> list[dict]:
+    def _single_text_part(parts: list) -> str | None:
+        """Get the text of a request made of a single text prompt, the usual shape.
+
+        Lets callers skip building and joining a list of parts for it.
+
+        Args:
+            parts: Parts of a model request
+
+        Returns:
+            The prompt text, or None if the request has any other shape
+        """
+        if len(parts) == 1:
+            part = parts[0]
+            if isinstance(part, (UserPromptPart, TextPart)) and isinstance(part.content, str):
+                return part.content
+        return None
+
+    @staticmethod
+    def _history_prefix(
+        messages: list[ModelMessage],
+        include_history: bool,
+        history_limit: int | None = None
+    ) -> str:
+        """Get the conversation history to prepend to a text prompt, if any."""
+        if include_history and RequestHandler.has_conversation_history(messages):
+            history = RequestHandler.extract_conversation_history(messages, history_limit)
+            if history:
+                return f"{history}\n\n"
+        return ""
+
+    @staticmethod
+    def extract_multimodal_content(
+        messages: list[ModelMessage],
+        include_history: bool = True,
+        history_limit: int | None = None
+    ) -> list[dict]:
         """Extract multimodal content including text and images, optionally with conversation history.
 
         Args:
             messages: List of model messages
             include_history: If True, prepend conversation history from previous turns
+            history_limit: Maximum number of previous messages to include in the history
+                (None for all of them)
 
         Returns:
             List of content blocks (text and image dicts), with history prepended if requested
@@ -56,7 +192,7 @@ class RequestHandler:
 
         # Add conversation history as first text block if requested
         if include_history and RequestHandler.has_conversation_history(messages):
-            history = RequestHandler.extract_conversation_history(messages)
+            history = RequestHandler.extract_conversation_history(messages, history_limit)
             if history:
                 content_blocks.append({
                     "type": "text",
@@ -65,57 +201,11 @@ class RequestHandler:
 
         # Extract most recent user message
         for msg in reversed(messages):
-            if isinstance(msg, _messages.ModelRequest):
+            if isinstance(msg, ModelRequest):
                 for part in msg.parts:
-                    # Handle text content
-                    if isinstance(part, _messages.UserPromptPart):
-                        # UserPromptPart.content can be str or list
-                        if isinstance(part.content, str):
-                            content_blocks.append({
-                                "type": "text",
-                                "text": part.content
-                            })
-                        elif isinstance(part.content, list):
-                            # Process each item in the list
-                            for item in part.content:
-                                if isinstance(item, str):
-                                    content_blocks.append({"type": "text", "text": item})
-                                elif isinstance(item, _messages.BinaryContent):
-                                    # Convert BinaryContent to dict
-                                    content_blocks.append(
-                                        RequestHandler._binary_content_to_dict(item)
-                                    )
-                                elif isinstance(item, _messages.ImageUrl):
-                                    # Convert ImageUrl to dict
-                                    content_blocks.append({
-                                        "type": "image",
-                                        "source": {
-                                            "type": "url",
-                                            "url": item.url
-                                        }
-                                    })
-                                elif isinstance(item, dict):
-                                    # Already a dict, use as-is
-                                    content_blocks.append(item)
-                    elif isinstance(part, _messages.TextPart):
-                        content_blocks.append({
-                            "type": "text",
-                            "text": part.content
-                        })
-                    # Handle image content (base64)
-                    elif isinstance(part, _messages.BinaryContent):
-                        content_blocks.append(
-                            RequestHandler._binary_content_to_dict(part)
-                        )
-                    # Handle image URLs
-                    elif isinstance(part, _messages.ImageUrl):
-                        content_blocks.append({
-                            "type": "image",
-                            "source": {
-                                "type": "url",
-                                "url": part.url
-                            }
-                        })
+                    handler = RequestHandler._part_handler(type(part))
+                    if handler is not None:
+                        handler(part, content_blocks)
 
                 # Return after processing the most recent user message
                 return content_blocks
@@ -123,7 +213,93 @@ class RequestHandler:
         return content_blocks
 
     @staticmethod
-    def _binary_content_to_dict(binary_content: _messages.BinaryContent) -> dict:
+    def _find_handler(handlers: dict[type, Any], obj_type: type) -> Any:
+        """Find the handler for a type in a dispatch table.
+
+        Exact types are a single dict lookup; subclasses fall back to a scan of
+        the table. The table itself is only read.
+
+        Args:
+            handlers: Dispatch table mapping types to handlers
+            obj_type: Type to find a handler for
+
+        Returns:
+            The handler, or None if the type isn't handled
+        """
+        handler = handlers.get(obj_type)
+        if handler is None:
+            handler = next((h for base, h in handlers.items() if issubclass(obj_type, base)), None)
+        return handler
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _part_handler(part_type: type) -> Any:
+        """Get the _PART_HANDLERS handler for a part type, cached per type."""
+        return RequestHandler._find_handler(RequestHandler._PART_HANDLERS, part_type)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _item_handler(item_type: type) -> Any:
+        """Get the _ITEM_HANDLERS handler for a content item type, cached per type."""
+        return RequestHandler._find_handler(RequestHandler._ITEM_HANDLERS, item_type)
+
+    @staticmethod
+    def _add_user_prompt_part(part: UserPromptPart, content_blocks: list[dict]) -> None:
+        """Append the content blocks for a user prompt part."""
+        # UserPromptPart.content can be str or list
+        if isinstance(part.content, str):
+            content_blocks.append({"type": "text", "text": part.content})
+        elif isinstance(part.content, list):
+            for item in part.content:
+                to_block = RequestHandler._item_handler(type(item))
+                if to_block is not None:
+                    content_blocks.append(to_block(item))
+
+    @staticmethod
+    def _add_text_part(part: TextPart, content_blocks: list[dict]) -> None:
+        """Append the text block for a text part."""
+        content_blocks.append({"type": "text", "text": part.content})
+
+    @staticmethod
+    def _add_binary_content(part: BinaryContent, content_blocks: list[dict]) -> None:
+        """Append the image block for binary content (base64)."""
+        content_blocks.append(RequestHandler._binary_content_to_dict(part))
+
+    @staticmethod
+    def _add_image_url(part: ImageUrl, content_blocks: list[dict]) -> None:
+        """Append the image block for an image URL."""
+        content_blocks.append(RequestHandler._image_url_to_dict(part))
+
+    @staticmethod
+    def _text_to_dict(text: str) -> dict:
+        """Convert a text item to a text block."""
+        return {"type": "text", "text": text}
+
+    @staticmethod
+    def _dict_item_to_dict(item: dict) -> dict:
+        """Use an item that is already a content block as-is."""
+        return item
+
+    @staticmethod
+    def _image_url_to_dict(image_url: ImageUrl) -> dict:
+        """Convert ImageUrl to image dict format.
+
+        Args:
+            image_url: Image URL to convert
+
+        Returns:
+            Image dict with the URL source
+        """
+        return {
+            "type": "image",
+            "source": {
+                "type": "url",
+                "url": image_url.url
+            }
+        }
+
+    @staticmethod
+    def _binary_content_to_dict(binary_content: BinaryContent) -> dict:
         """Convert BinaryContent to image dict format.
 
         Args:
@@ -134,7 +310,7 @@ class RequestHandler:
         """
         # Encode image data to base64 if not already
         if isinstance(binary_content.data, bytes):
-            image_b64 = base64.b64encode(binary_content.data).decode('utf-8')
+            image_b64 = _encode_base64(binary_content)
         else:
             image_b64 = binary_content.data
 
@@ -147,8 +323,25 @@ class RequestHandler:
             }
         }
 
+    # Dispatch tables for extract_multimodal_content, keyed by exact type.
+    # Part handlers append to the block list; item handlers return one block.
+    # The tables are never modified; _part_handler and _item_handler cache the
+    # handlers resolved for subclasses and unhandled types.
+    _PART_HANDLERS: dict[type, Any] = {
+        UserPromptPart: _add_user_prompt_part,
+        TextPart: _add_text_part,
+        BinaryContent: _add_binary_content,
+        ImageUrl: _add_image_url,
+    }
+    _ITEM_HANDLERS: dict[type, Any] = {
+        str: _text_to_dict,
+        BinaryContent: _binary_content_to_dict,
+        ImageUrl: _image_url_to_dict,
+        dict: _dict_item_to_dict,
+    }
+
     @staticmethod
-    def has_images(messages: list[_messages.ModelMessage]) -> bool:
+    def has_images(messages: list[ModelMessage]) -> bool:
         """Check if the messages contain any images.
 
         Args:
@@ -158,43 +351,55 @@ class RequestHandler:
             True if images are present, False otherwise
         """
         for msg in messages:
-            if isinstance(msg, _messages.ModelRequest):
+            if isinstance(msg, ModelRequest):
                 for part in msg.parts:
-                    # Check direct types
-                    if isinstance(part, (_messages.BinaryContent, _messages.ImageUrl)):
+                    # Check direct types (isinstance, like extract_content, so
+                    # subclasses are detected too)
+                    if isinstance(part, _IMAGE_TYPES):
                         return True
                     # Check if UserPromptPart contains a list (multimodal)
-                    if isinstance(part, _messages.UserPromptPart):
+                    if isinstance(part, UserPromptPart):
                         if isinstance(part.content, list):
                             return True  # List format indicates multimodal content
         return False
 
     @staticmethod
-    def extract_system_messages(messages: list[_messages.ModelMessage]) -> str:
+    def extract_system_messages(messages: list[ModelMessage]) -> str:
         """Extract and combine system messages.
 
+        pydantic-ai attaches the agent's instructions to every request, so only
+        the most recent instructions are used rather than one copy per turn.
+        They stay where that request puts them, after the system prompt parts
+        of earlier requests. System prompt parts are kept from all requests,
+        since they usually only appear in the first one.
+
         Args:
             messages: List of model messages
 
         Returns:
             Combined system prompt
         """
+        # Collected newest first and reversed at the end, so each request's
+        # instructions land before its own system prompt parts
+        have_instructions = False
         system_parts = []
-        for msg in messages:
-            if isinstance(msg, _messages.ModelRequest):
-                # Check instructions attribute
-                if msg.instructions:
-                    system_parts.append(msg.instructions)
-
-                # Also check for SystemPromptPart in parts
-                for part in msg.parts:
-                    if isinstance(part, _messages.SystemPromptPart):
+        for msg in reversed(messages):
+            if isinstance(msg, ModelRequest):
+                # Check for SystemPromptPart in parts
+                for part in reversed(msg.parts):
+                    if isinstance(part, SystemPromptPart):
                         system_parts.append(part.content)
 
+                # Also check instructions attribute
+                if not have_instructions and msg.instructions:
+                    system_parts.append(msg.instructions)
+                    have_instructions = True
+
+        system_parts.reverse()
         return "\n".join(system_parts)
 
     @staticmethod
-    def check_for_tool_returns(messages: list[_messages.ModelMessage]) -> list[_messages.ToolReturnPart]:
+    def check_for_tool_returns(messages: list[ModelMessage]) -> list[ToolReturnPart]:
         """Check if messages contain tool return parts from previous turns.
 
         Args:
@@ -208,14 +413,14 @@ class RequestHandler:
             # Tool returns can be in ModelResponse OR ModelRequest messages
             if hasattr(msg, 'parts'):
                 for part in msg.parts:
-                    if isinstance(part, _messages.ToolReturnPart):
+                    if isinstance(part, ToolReturnPart):
                         tool_returns.append(part)
         return tool_returns
 
     @staticmethod
     def append_tool_results_to_content(
         user_content: str | list[dict],
-        tool_returns: list[_messages.ToolReturnPart]
+        tool_returns: list[ToolReturnPart]
     ) -> str | list[dict]:
         """Append tool results to user content.
 
@@ -241,15 +446,18 @@ class RequestHandler:
             return updated_content
 
     @staticmethod
-    def extract_conversation_history(messages: list[_messages.ModelMessage]) -> str:
+    def extract_conversation_history(messages: list[ModelMessage], history_limit: int | None = None) -> str:
         """Extract previous conversation turns for multi-turn conversations.
 
         This extracts ALL previous user-assistant exchanges from the message history
-        to provide context for multi-turn conversations. Returns empty string if no
-        previous exchanges exist.
+        to provide context for multi-turn conversations, or only the most recent
+        ones when history_limit is set. Returns empty string if no previous
+        exchanges exist.
 
         Args:
             messages: Full message history including previous turns
+            history_limit: Maximum number of previous messages to keep, counting
+                from the most recent (None keeps all of them)
 
         Returns:
             Formatted conversation history as string
@@ -257,11 +465,11 @@ class RequestHandler:
         conversation_parts = []
 
         for msg in messages:
-            if isinstance(msg, _messages.ModelRequest):
+            if isinstance(msg, ModelRequest):
                 # Extract user messages from this turn
                 user_parts = []
                 for part in msg.parts:
-                    if isinstance(part, _messages.UserPromptPart):
+                    if isinstance(part, UserPromptPart):
                         if isinstance(part.content, str):
                             user_parts.append(part.content)
                         elif isinstance(part.content, list):
@@ -271,17 +479,17 @@ class RequestHandler:
                                     user_parts.append(item)
                                 elif isinstance(item, dict) and item.get('type') == 'text':
                                     user_parts.append(item.get('text', ''))
-                    elif isinstance(part, _messages.TextPart):
+                    elif isinstance(part, TextPart):
                         user_parts.append(part.content)
 
                 if user_parts:
                     conversation_parts.append(("user", "\n".join(user_parts)))
 
-            elif isinstance(msg, _messages.ModelResponse):
+            elif isinstance(msg, ModelResponse):
                 # Extract assistant responses from this turn
                 response_parts = []
                 for part in msg.parts:
-                    if isinstance(part, _messages.TextPart):
+                    if isinstance(part, TextPart):
                         response_parts.append(part.content)
 
                 if response_parts:
@@ -292,6 +500,10 @@ class RequestHandler:
         if conversation_parts and conversation_parts[-1][0] == "user":
             conversation_parts = conversation_parts[:-1]
 
+        # Drop the oldest messages beyond the limit
+        if history_limit is not None and len(conversation_parts) > history_limit:
+            conversation_parts = conversation_parts[len(conversation_parts) - history_limit:]
+
         # Format as conversation history
         if not conversation_parts:
             return ""
@@ -306,7 +518,7 @@ class RequestHandler:
         return "\n\n".join(formatted_history)
 
     @staticmethod
-    def has_conversation_history(messages: list[_messages.ModelMessage]) -> bool:
+    def has_conversation_history(messages: list[ModelMessage]) -> bool:
         """Check if messages contain previous conversation turns.
 
         Args:
@@ -316,6 +528,6 @@ class RequestHandler:
             True if there are previous exchanges (ModelResponse messages)
         """
         for msg in messages:
-            if isinstance(msg, _messages.ModelResponse):
+            if isinstance(msg, ModelResponse):
                 return True
         return False
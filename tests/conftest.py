@@ -3,51 +3,145 @@
 This module provides common fixtures and utilities for testing clowclow.
 
 Fixtures:
-- test_workspace: Temporary directory for file operations
+- event_loop_policy: uvloop policy for async tests when uvloop is installed
+- test_workspace: Temporary directory for file operations (shared per module)
+- workspace_subdir: Empty per-test directory inside test_workspace
 - test_image_data: Sample image binary data for multimodal testing
 - test_image_url: Sample image URL for multimodal testing
-- mock_claude_client: Mocked CustomClaudeCodeClient for unit tests
+- mock_claude_client: Stubbed CustomClaudeCodeClient for unit tests
 - test_model_agent: Agent with TestModel for baseline testing
+- captured_testmodel_messages: Messages captured once per session from a TestModel run
+- claude_code_model: Session-wide ClaudeCodeModel for agent tests
+- agent_factory: Cached Agents around claude_code_model, keyed by system prompt and deps type
+- claude_cassette: Opt-in record/replay of Claude Code responses in live tests (autouse)
+- live_results: A test class's independent live prompts, run concurrently once per class
 """
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import shutil
 from pathlib import Path
-from unittest.mock import AsyncMock, Mock
+from typing import TYPE_CHECKING, Any, Callable
 
 import pytest
-from pydantic_ai import Agent
-from pydantic_ai.models.test import TestModel
+import pytest_asyncio
+
+# pydantic_ai is imported inside the fixtures that use it, so collection
+# (e.g. `pytest --collect-only` or `-k` runs) doesn't pay for importing it here
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+    from pydantic_ai.messages import ModelMessage, ModelRequest
+
+# Minimal 1x1 red PNG, decoded once at import
+_TEST_PNG = base64.b64decode(
+    'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8DwHwAFBQIAX8jx0gAAAABJRU5ErkJggg=='
+)
+
+# Integration modules whose tests are all marked live. They are skipped at
+# collection time when live tests are deselected, so running `-m "not live"`
+# doesn't pay for importing them. tests/integration/test_live_only_modules.py
+# fails if one of them gains a test that isn't marked live.
+_LIVE_ONLY_MODULES = frozenset({
+    'test_agent_multimodal.py',
+    'test_agent_multiturn.py',
+    'test_system_prompt_multiturn.py',
+})
+
+
+def _live_deselected(markexpr: str) -> bool:
+    """Check whether a -m expression always deselects live tests.
+
+    Only the plain `not live` form and `and`-chains containing it are
+    recognized; anything else falls back to normal collection.
+    """
+    if ' or ' in markexpr:
+        return False
+    return any(term.strip() == 'not live' for term in markexpr.split(' and '))
 
 
-@pytest.fixture
-def test_workspace(tmp_path: Path) -> Path:
-    """Provide a temporary workspace directory for tests.
+def pytest_ignore_collect(collection_path: Path, config: pytest.Config) -> bool | None:
+    """Skip live-only modules when live tests are deselected with -m."""
+    if collection_path.name in _LIVE_ONLY_MODULES and _live_deselected(config.getoption('markexpr')):
+        return True
+    return None
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Skip live tests up front when they can neither call nor replay Claude Code.
+
+    Without the claude CLI on PATH, live tests can only run by replaying
+    recorded responses. Unless --replay-cassettes was given, every live test
+    is skipped here instead of each one building a model only to fail on its
+    first query. When replaying, a test whose call has no recording is
+    skipped when it makes that call.
+    """
+    if shutil.which('claude') is not None:
+        return
+    if _cassette_mode(config) is False:
+        return
+
+    skip_live = pytest.mark.skip(reason="claude CLI not found (pass --replay-cassettes to replay recordings)")
+    for item in items:
+        if item.get_closest_marker('live') is not None:
+            item.add_marker(skip_live)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Run async tests on uvloop when it is installed.
+
+    Overrides pytest-asyncio's fixture of the same name. uvloop is a dev
+    dependency everywhere except Windows; without it the default policy is used.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(scope="module")
+def test_workspace(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Provide a temporary workspace directory shared by the tests in a module.
+
+    Tests that need an empty directory of their own should use workspace_subdir.
 
     Returns:
-        Path to a clean temporary directory for test file operations.
+        Path to a temporary directory for test file operations.
     """
-    workspace = tmp_path / "workspace"
-    workspace.mkdir()
-    return workspace
+    return tmp_path_factory.mktemp("workspace")
 
 
 @pytest.fixture
+def workspace_subdir(test_workspace: Path, request: pytest.FixtureRequest) -> Path:
+    """Provide an empty per-test directory inside the module workspace.
+
+    Returns:
+        Path to a directory that only the requesting test uses.
+    """
+    subdir = test_workspace / request.node.name
+    subdir.mkdir()
+    return subdir
+
+
+@pytest.fixture(scope="session")
 def test_image_data() -> bytes:
     """Provide test image data (1x1 PNG).
 
     Returns:
         Minimal valid PNG image as bytes.
     """
-    # Minimal 1x1 red PNG
-    png_data = base64.b64decode(
-        'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8DwHwAFBQIAX8jx0gAAAABJRU5ErkJggg=='
-    )
-    return png_data
+    return _TEST_PNG
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_image_url() -> str:
     """Provide a test image URL.
 
@@ -57,21 +151,32 @@ def test_image_url() -> str:
     return 'https://example.com/test-image.png'
 
 
-@pytest.fixture
-def mock_claude_client(test_workspace: Path):
-    """Provide a mocked CustomClaudeCodeClient for unit testing.
+class _FakeClaudeClient:
+    """Lightweight stand-in for CustomClaudeCodeClient.
 
-    Returns:
-        Mock client with simple_query and structured_query async methods.
+    Plain async methods with canned results avoid the spec introspection and
+    call recording of Mock/AsyncMock; tests that need call assertions can
+    patch the methods themselves.
     """
-    from clowclow.claude_client import CustomClaudeCodeClient
 
-    client = Mock(spec=CustomClaudeCodeClient)
-    client.workspace_dir = test_workspace
-    client.simple_query = AsyncMock(return_value="Mocked response")
-    client.structured_query = AsyncMock()
+    def __init__(self, workspace_dir: Path):
+        self.workspace_dir = workspace_dir
+
+    async def simple_query(self, *args, **kwargs) -> str:
+        return "Mocked response"
+
+    async def structured_query(self, *args, **kwargs):
+        return None
 
-    return client
+
+@pytest.fixture
+def mock_claude_client(test_workspace: Path) -> _FakeClaudeClient:
+    """Provide a stubbed CustomClaudeCodeClient for unit testing.
+
+    Returns:
+        Stub client with simple_query and structured_query async methods.
+    """
+    return _FakeClaudeClient(test_workspace)
 
 
 @pytest.fixture
@@ -81,9 +186,31 @@ def test_model_agent() -> Agent:
     Returns:
         Agent configured with TestModel for fast, deterministic tests.
     """
+    from pydantic_ai import Agent
+    from pydantic_ai.models.test import TestModel
+
     return Agent(TestModel())
 
 
+@pytest.fixture(scope="session")
+def captured_testmodel_messages() -> list[ModelMessage]:
+    """Provide the messages captured from one TestModel run of "Test query".
+
+    The run happens once per session; tests that only inspect the message
+    structure share the result and must treat it as read-only.
+
+    Returns:
+        Messages captured with capture_run_messages during the run.
+    """
+    from pydantic_ai import Agent, capture_run_messages
+    from pydantic_ai.models.test import TestModel
+
+    agent = Agent(TestModel())
+    with capture_run_messages() as messages:
+        agent.run_sync("Test query")
+    return list(messages)
+
+
 @pytest.fixture(scope="session")
 def claude_model() -> str:
     """Provide Claude model name for live tests.
@@ -114,25 +241,271 @@ def claude_model() -> str:
     return "claude-3-5-haiku-20241022"
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="session")
+def claude_code_model(claude_model: str):
+    """Provide a ClaudeCodeModel shared by the whole test session.
+
+    The model holds no per-request state, so tests can reuse one instance.
+    Tests that need their own configuration should still build one inline.
+
+    Returns:
+        ClaudeCodeModel configured with the claude_model fixture's model.
+    """
+    from clowclow import ClaudeCodeModel
+
+    return ClaudeCodeModel(model=claude_model)
+
+
+@pytest.fixture(scope="session")
+def agent_factory(claude_code_model):
+    """Provide a factory for Agents around the shared claude_code_model.
+
+    Agents are cached by (system_prompt, deps_type), so tests asking for the
+    same configuration reuse one Agent. Tests that register tools must build
+    their own Agent instead, since tools would leak into other tests.
+
+    Returns:
+        Callable taking optional system_prompt and deps_type and returning an Agent.
+    """
+    from pydantic_ai import Agent
+
+    agents: dict[tuple, Agent] = {}
+
+    def make_agent(system_prompt: str | None = None, deps_type: type | None = None) -> Agent:
+        key = (system_prompt, deps_type)
+        if key not in agents:
+            kwargs = {}
+            if system_prompt is not None:
+                kwargs['system_prompt'] = system_prompt
+            if deps_type is not None:
+                kwargs['deps_type'] = deps_type
+            agents[key] = Agent(claude_code_model, **kwargs)
+        return agents[key]
+
+    return make_agent
+
+
+@pytest.fixture(autouse=True, scope="class")
 def setup_claude_model(request, claude_model):
-    """Automatically inject claude_model into test class instances.
+    """Automatically inject claude_model into test classes.
 
-    This fixture runs automatically for all tests and sets self.claude_model
-    for test class methods, so they can use it without adding as a parameter.
+    Runs once per test class (rather than once per test) and sets
+    claude_model as a class attribute, so test methods can use
+    self.claude_model without adding it as a parameter.
     """
-    if request.instance:  # Only for class-based tests
-        request.instance.claude_model = claude_model
+    if request.cls is not None:  # Only for class-based tests
+        request.cls.claude_model = claude_model
 
 
-@pytest.fixture
-def sample_messages():
+# Recorded client responses replayed by the claude_cassette fixture
+_CASSETTE_DIR = Path(__file__).parent / "cassettes"
+
+# CustomClaudeCodeClient methods that reach the Claude Code CLI
+_CASSETTE_METHODS = ('simple_query', 'structured_query', 'tools_query')
+
+
+def _cassette_path(method_name: str, model: str | None, arguments: dict[str, Any]) -> Path:
+    """Get the cassette file for one client call.
+
+    The key covers everything that shapes the response: the method, the model
+    and the call arguments, with output classes identified by their schema.
+    """
+    key_arguments = dict(arguments)
+    if 'pydantic_class' in key_arguments:
+        key_arguments['pydantic_class'] = key_arguments['pydantic_class'].model_json_schema()
+    key_source = json.dumps(
+        {'method': method_name, 'model': model, 'arguments': key_arguments},
+        sort_keys=True,
+        default=str
+    )
+    digest = hashlib.sha256(key_source.encode()).hexdigest()[:32]
+    return _CASSETTE_DIR / f"{method_name}_{digest}.json"
+
+
+# Result messages seen by the client call currently being recorded
+_QUERY_RESULTS: contextvars.ContextVar[list[Any]] = contextvars.ContextVar('_QUERY_RESULTS')
+
+
+class _ResultObserver:
+    """Wrap an SDK client to note the result messages of its responses.
+
+    The CLI reports failures such as authentication errors as ordinary
+    response text, so the result message is the only sign that a query failed.
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    async def receive_response(self):
+        from claude_agent_sdk import ResultMessage
+
+        results = _QUERY_RESULTS.get(None)
+        async for message in self._client.receive_response():
+            if results is not None and isinstance(message, ResultMessage):
+                results.append(message)
+            yield message
+
+
+def _observe_results(collect: Callable) -> Callable:
+    """Wrap QueryStrategy._collect_response_text to pass results to _QUERY_RESULTS."""
+
+    @functools.wraps(collect)
+    async def wrapper(client):
+        return await collect(_ResultObserver(client))
+
+    return wrapper
+
+
+def _with_cassette(method: Callable, record: bool) -> Callable:
+    """Wrap a client query method to record or replay its responses.
+
+    Args:
+        method: Unbound CustomClaudeCodeClient query method
+        record: If True, call through and record successful responses;
+            otherwise replay recorded responses and skip calls without one
+
+    Returns:
+        Replacement method with the same signature
+    """
+    from pydantic_core import from_json
+
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        del arguments['self']
+        path = _cassette_path(method.__name__, self.config.model, arguments)
+
+        if not record:
+            if not path.exists():
+                pytest.skip(f"No recorded response in {path.name}; run with --record-cassettes")
+            recorded = from_json(path.read_bytes())['response']
+            if 'pydantic_class' in arguments:
+                return arguments['pydantic_class'].model_validate(recorded)
+            return recorded
+
+        results: list[Any] = []
+        token = _QUERY_RESULTS.set(results)
+        try:
+            response = await method(self, *args, **kwargs)
+        finally:
+            _QUERY_RESULTS.reset(token)
+
+        # Only record queries whose every result reported success
+        if results and all(r.subtype == 'success' and not r.is_error for r in results):
+            recorded = response.model_dump(mode='json') if 'pydantic_class' in arguments else response
+            _CASSETTE_DIR.mkdir(exist_ok=True)
+            path.write_text(json.dumps({'response': recorded}, indent=2, sort_keys=True))
+        return response
+
+    return wrapper
+
+
+def _cassette_mode(config: pytest.Config) -> bool | None:
+    """Get whether live tests record (True), replay (False) or do neither (None)."""
+    if config.getoption('record_cassettes'):
+        return True
+    if config.getoption('replay_cassettes'):
+        return False
+    return None
+
+
+@pytest.fixture(autouse=True)
+def claude_cassette(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Record or replay Claude Code responses in live tests, when asked to.
+
+    With --record-cassettes, live tests call Claude Code and record each
+    successful response under tests/cassettes/. With --replay-cassettes they
+    replay those recordings instead of calling the API. Otherwise live tests
+    call the API as usual.
+    """
+    if request.node.get_closest_marker('live') is None:
+        return
+
+    record = _cassette_mode(request.config)
+    if record is not None:
+        _use_cassettes(monkeypatch, record)
+
+
+def _use_cassettes(monkeypatch: pytest.MonkeyPatch, record: bool) -> None:
+    """Patch the client query methods to record or replay responses."""
+    from clowclow.claude_client import CustomClaudeCodeClient
+    from clowclow.query_strategies import QueryStrategy
+
+    if record:
+        monkeypatch.setattr(
+            QueryStrategy,
+            '_collect_response_text',
+            staticmethod(_observe_results(QueryStrategy._collect_response_text))
+        )
+    for method_name in _CASSETTE_METHODS:
+        method = getattr(CustomClaudeCodeClient, method_name)
+        monkeypatch.setattr(CustomClaudeCodeClient, method_name, _with_cassette(method, record))
+
+
+@pytest_asyncio.fixture(scope="class", loop_scope="session")
+async def live_results(request: pytest.FixtureRequest, claude_code_model) -> Callable[[str], Any]:
+    """Run a test class's independent live prompts concurrently.
+
+    The class declares LIVE_PROMPTS, a dict mapping a key to an
+    (output_type, prompt) pair. On first use in the class the prompts are
+    sent concurrently, up to DEFAULT_MAX_CONCURRENT_REQUESTS at a time, so
+    the class waits for the slowest responses rather than the sum of them.
+    Responses go through the same cassettes as claude_cassette, which only
+    patches per test and so can't cover this class-scoped setup.
+
+    Returns:
+        Function taking a LIVE_PROMPTS key and returning that prompt's
+        agent run result, re-raising the run's exception if it failed.
+    """
+    from pydantic_ai import Agent
+
+    from clowclow.constants import DEFAULT_MAX_CONCURRENT_REQUESTS
+
+    prompts = request.cls.LIVE_PROMPTS
+
+    # Same cap as ClaudeCodeModel.request_many, so a large class doesn't
+    # start more Claude Code sessions at once than the model would
+    semaphore = asyncio.Semaphore(DEFAULT_MAX_CONCURRENT_REQUESTS)
+
+    async def run(output_type: Any, prompt: str) -> Any:
+        async with semaphore:
+            return await Agent(claude_code_model, output_type=output_type).run(prompt)
+
+    # Runs on the session loop shared with the async tests, rather than on a
+    # separate loop of its own
+    record = _cassette_mode(request.config)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        if record is not None:
+            _use_cassettes(monkeypatch, record)
+        results = await asyncio.gather(
+            *(run(output_type, prompt) for output_type, prompt in prompts.values()),
+            return_exceptions=True
+        )
+    outcomes = dict(zip(prompts, results))
+
+    def result_for(key: str) -> Any:
+        outcome = outcomes[key]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    return result_for
+
+
+@pytest.fixture(scope="session")
+def sample_messages() -> dict[str, list[ModelRequest]]:
     """Provide sample message structures for testing.
 
+    Session-scoped: tests must treat the returned messages as read-only.
+
     Returns:
         Dict of common message patterns used in tests.
     """
-    from pydantic_ai.messages import ModelRequest, TextPart, UserPromptPart, BinaryContent
+    from pydantic_ai.messages import BinaryContent, ModelRequest, TextPart
 
     return {
         'simple_text': [
@@ -160,6 +533,22 @@ def sample_messages():
     }
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add clowclow's command line options."""
+    parser.addoption(
+        '--record-cassettes',
+        action='store_true',
+        default=False,
+        help="Call Claude Code in live tests and overwrite their recorded responses"
+    )
+    parser.addoption(
+        '--replay-cassettes',
+        action='store_true',
+        default=False,
+        help="Replay recorded responses in live tests instead of calling Claude Code"
+    )
+
+
 # Configure pytest markers
 def pytest_configure(config):
     """Configure custom pytest markers."""
@@ -32,20 +32,17 @@ class TestBasicAgentIntegration:
         result = agent.run_sync("Test query")
         assert result.output is not None
 
-    def test_agent_creation_with_claude_code_model(self):
+    def test_agent_creation_with_claude_code_model(self, agent_factory):
         """Test that ClaudeCodeModel can be used to create an Agent."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         assert agent is not None
         assert agent.model.model_name == "claude-code"
         assert agent.model.system == "claude-code"
 
-    def test_agent_with_system_prompt(self):
+    def test_agent_with_system_prompt(self, agent_factory):
         """Test creating agent with system prompt."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(
-            model,
+        agent = agent_factory(
             system_prompt="You are a helpful assistant."
         )
 
@@ -67,11 +64,9 @@ class TestLiveBasicIntegration:
     """Live integration tests using real Claude Code API."""
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_agent_run_simple_query(self):
+    async def test_agent_run_simple_query(self, agent_factory):
         """Test running a simple query through the agent with real API."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         result = await agent.run("What is 2+2?")
 
@@ -85,12 +80,9 @@ class TestLiveBasicIntegration:
         assert len(result.output) >= 1, "Response should be at least 1 character"
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_agent_with_system_prompt_live(self):
+    async def test_agent_with_system_prompt_live(self, agent_factory):
         """Test agent with system prompt using real API."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(
-            model,
+        agent = agent_factory(
             system_prompt="You are a concise math tutor. Answer in one sentence."
         )
 
@@ -104,10 +96,9 @@ class TestLiveBasicIntegration:
         assert len(result.output) < 200, "Response should be concise per system prompt"
 
     @pytest.mark.live
-    def test_agent_run_sync_live(self):
+    def test_agent_run_sync_live(self, agent_factory):
         """Test synchronous agent run with real API."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         result = agent.run_sync("Say hello")
 
@@ -123,26 +114,19 @@ class TestLiveBasicIntegration:
 class TestAgentWithDependencies:
     """Test Agent with dependency injection."""
 
-    def test_agent_with_deps_type(self):
+    def test_agent_with_deps_type(self, agent_factory):
         """Test agent with typed dependencies."""
-        model = ClaudeCodeModel(model=self.claude_model)
-
         # Create agent with typed dependencies
-        agent = Agent(
-            model,
+        agent = agent_factory(
             deps_type=str,
         )
 
         assert agent is not None
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_agent_with_deps_live(self):
+    async def test_agent_with_deps_live(self, agent_factory):
         """Test agent with dependency injection using real API."""
-        model = ClaudeCodeModel(model=self.claude_model)
-
-        agent = Agent(
-            model,
+        agent = agent_factory(
             deps_type=dict,
             system_prompt="You are a helpful assistant. Answer questions concisely."
         )
@@ -168,11 +152,9 @@ class TestAgentWithDependencies:
 class TestAgentModelOverride:
     """Test agent model override functionality."""
 
-    @pytest.mark.asyncio
-    async def test_override_model_with_test_model(self):
+    async def test_override_model_with_test_model(self, agent_factory):
         """Test overriding ClaudeCodeModel with TestModel for testing."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         # Override with TestModel for fast testing
         with agent.override(model=TestModel()):
@@ -195,13 +177,9 @@ class TestAgentUsageTracking:
 class TestMessageInspection:
     """Test message inspection using capture_run_messages."""
 
-    @pytest.mark.asyncio
-    async def test_capture_messages_with_test_model(self):
+    def test_capture_messages_with_test_model(self, captured_testmodel_messages):
         """Test message capture with TestModel."""
-        agent = Agent(TestModel())
-
-        with capture_run_messages() as messages:
-            result = await agent.run("Test query")
+        messages = captured_testmodel_messages
 
         # Should have captured messages
         assert len(messages) > 0
@@ -209,11 +187,9 @@ class TestMessageInspection:
         assert messages[0].kind == "request"
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_capture_messages_with_claude_code(self):
+    async def test_capture_messages_with_claude_code(self, agent_factory):
         """Test message capture with ClaudeCodeModel."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         with capture_run_messages() as messages:
             result = await agent.run("Say hello")
@@ -224,13 +200,11 @@ class TestMessageInspection:
         assert messages[-1].kind == "response"
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_capture_messages_with_system_prompt(self):
+    async def test_capture_messages_with_system_prompt(self, agent_factory):
         """Test that system prompt appears in messages."""
         from pydantic_ai.messages import SystemPromptPart
 
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, system_prompt="You are a helpful assistant.")
+        agent = agent_factory(system_prompt="You are a helpful assistant.")
 
         with capture_run_messages() as messages:
             await agent.run("Test")
@@ -251,7 +225,6 @@ class TestMessageInspection:
 class TestAgentBehaviorConsistency:
     """Test that ClaudeCodeModel behaves consistently with TestModel."""
 
-    @pytest.mark.asyncio
     async def test_response_structure_matches_testmodel(self):
         """Verify ClaudeCodeModel returns same structure as TestModel."""
         test_agent = Agent(TestModel())
@@ -262,27 +235,21 @@ class TestAgentBehaviorConsistency:
         assert hasattr(test_result, 'usage')
         # Note: Can't test ClaudeCodeModel without live API
 
-    def test_agent_initialization_consistency(self):
+    def test_agent_initialization_consistency(self, agent_factory, claude_code_model):
         """Test that both models initialize agents the same way."""
         test_model = TestModel()
-        claude_model = ClaudeCodeModel(model=self.claude_model)
 
         test_agent = Agent(test_model)
-        claude_agent = Agent(claude_model)
+        claude_agent = agent_factory()
 
-        # Both should have same attributes
-        assert hasattr(test_agent, 'model')
-        assert hasattr(claude_agent, 'model')
-        assert hasattr(test_agent, 'run')
-        assert hasattr(claude_agent, 'run')
-        assert hasattr(test_agent, 'run_sync')
-        assert hasattr(claude_agent, 'run_sync')
+        # Both agents should hold the model they were given as-is
+        assert test_agent.model is test_model
+        assert claude_agent.model is claude_code_model
 
 
 class TestErrorHandling:
     """Test error handling in Agent with ClaudeCodeModel."""
 
-    @pytest.mark.asyncio
     async def test_empty_query_with_test_model(self):
         """Baseline: empty query with TestModel."""
         agent = Agent(TestModel())
@@ -291,11 +258,9 @@ class TestErrorHandling:
         assert result is not None
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_empty_query_with_claude_code(self):
+    async def test_empty_query_with_claude_code(self, agent_factory):
         """Test empty query with ClaudeCodeModel."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         # Should handle empty query gracefully
         result = await agent.run("")
@@ -307,47 +272,28 @@ class TestResponseValidation:
     """Test that responses are properly validated."""
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_response_is_nonempty_string(self):
-        """Verify response contains actual content."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+    async def test_multiple_runs_return_valid_responses(self, agent_factory):
+        """Verify responses contain actual content across runs of one agent."""
+        agent = agent_factory()
 
-        result = await agent.run("What is 2+2?")
+        result1 = await agent.run("What is 2+2?")
 
         # Should have non-empty output
-        assert result.output is not None
-        assert isinstance(result.output, str)
-        assert len(result.output) > 0, "Response should not be empty"
+        assert result1.output is not None
+        assert isinstance(result1.output, str)
+        assert len(result1.output) > 0, "First response should not be empty"
         # Should contain the answer
-        assert "4" in result.output, "Response should contain '4'"
+        assert "4" in result1.output, "First response should contain '4'"
         # Verify reasonable response length
-        assert 1 <= len(result.output) <= 1000, "Response should be reasonable length"
+        assert 1 <= len(result1.output) <= 1000, "First response should be reasonable length"
         # Verify it's not just whitespace
-        assert result.output.strip(), "Response should not be just whitespace"
+        assert result1.output.strip(), "First response should not be just whitespace"
 
-    @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_multiple_runs_maintain_state(self):
-        """Test that multiple runs work correctly."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
-
-        result1 = await agent.run("What is 3 + 5?")
+        # A second run on the same agent should work just as well
         result2 = await agent.run("What is 10 - 2?")
 
-        # Both should succeed with non-empty responses
-        assert result1.output is not None
         assert result2.output is not None
-        assert isinstance(result1.output, str)
         assert isinstance(result2.output, str)
-        assert len(result1.output) > 0, "First response should not be empty"
         assert len(result2.output) > 0, "Second response should not be empty"
-
-        # Verify correct answers
-        assert "8" in result1.output, "First response should contain '8'"
         assert "8" in result2.output, "Second response should contain '8'"
-
-        # Both should have non-empty stripped content
-        assert result1.output.strip()
-        assert result2.output.strip()
+        assert result2.output.strip(), "Second response should not be just whitespace"
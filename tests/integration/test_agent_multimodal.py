@@ -11,18 +11,14 @@ import pytest
 from pydantic_ai import Agent
 from pydantic_ai.messages import ImageUrl, BinaryContent
 
-from clowclow import ClaudeCodeModel
-
 
 class TestImageURLInput:
     """Test image URL inputs."""
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_agent_with_image_url(self, test_image_url: str):
+    async def test_agent_with_image_url(self, agent_factory, test_image_url: str):
         """Test agent handling image URL input."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         # Send message with image URL
         result = await agent.run([
@@ -42,11 +38,9 @@ class TestImageURLInput:
             f"Response should reference the image, got: {result.output}"
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_agent_with_multiple_image_urls(self):
+    async def test_agent_with_multiple_image_urls(self, agent_factory):
         """Test agent with multiple image URLs."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         result = await agent.run([
             "Compare these images:",
@@ -57,11 +51,9 @@ class TestImageURLInput:
         assert result.output is not None
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_agent_text_and_image_interleaved(self, test_image_url: str):
+    async def test_agent_text_and_image_interleaved(self, agent_factory, test_image_url: str):
         """Test interleaving text and images."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         result = await agent.run([
             "Look at this first image:",
@@ -76,71 +68,30 @@ class TestBinaryImageContent:
     """Test binary image content inputs."""
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_agent_with_binary_image(self, test_image_data: bytes):
-        """Test agent with binary image content."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+    @pytest.mark.parametrize("media_type", ["image/png", "image/jpeg", "image/webp"])
+    async def test_agent_with_image(self, agent_factory, test_image_data: bytes, media_type: str):
+        """Test agent with binary images of each supported media type."""
+        agent = agent_factory()
 
         result = await agent.run([
-            "Analyze this image:",
-            BinaryContent(data=test_image_data, media_type="image/png")
+            "Describe this image:",
+            BinaryContent(data=test_image_data, media_type=media_type)
         ])
 
-        # Verify response structure
         assert result.output is not None
         assert isinstance(result.output, str)
-        assert len(result.output) > 0, "Response should not be empty"
-        assert result.output.strip(), "Response should not be just whitespace"
-
-        # Verify it's an image analysis response
-        analysis_keywords = ["image", "picture", "pixel", "color", "visual", "see", "show", "red"]
-        assert any(kw in result.output.lower() for kw in analysis_keywords), \
-            f"Response should be about image analysis, got: {result.output}"
-
-        # Note: test_image_data is a 1x1 red PNG - responses should reflect this
-        # The model should recognize it's a minimal/tiny image
-
-    @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_agent_with_jpeg_image(self, test_image_data: bytes):
-        """Test agent with JPEG image."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
-
-        result = await agent.run([
-            "What's in this JPEG?",
-            BinaryContent(data=test_image_data, media_type="image/jpeg")
-        ])
-
-        assert result.output is not None
-
-    @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_agent_with_webp_image(self, test_image_data: bytes):
-        """Test agent with WebP image."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
-
-        result = await agent.run([
-            "Describe this WebP image:",
-            BinaryContent(data=test_image_data, media_type="image/webp")
-        ])
-
-        assert result.output is not None
+        assert len(result.output) > 0, f"{media_type} image should generate a response"
 
 
 class TestMixedContent:
     """Test mixed content types."""
 
     @pytest.mark.live
-    @pytest.mark.asyncio
     async def test_text_url_and_binary_image(
-        self, test_image_url: str, test_image_data: bytes
+        self, agent_factory, test_image_url: str, test_image_data: bytes
     ):
         """Test mixing text, image URL, and binary image."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         result = await agent.run([
             "First, look at this URL image:",
@@ -153,12 +104,9 @@ class TestMixedContent:
         assert result.output is not None
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_multimodal_with_system_prompt(self, test_image_data: bytes):
+    async def test_multimodal_with_system_prompt(self, agent_factory, test_image_data: bytes):
         """Test multimodal input with system prompt."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(
-            model,
+        agent = agent_factory(
             system_prompt="You are an image analysis expert. Be detailed."
         )
 
@@ -176,14 +124,12 @@ class TestMultimodalWithTools:
     """
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_image_with_tool_calling(self, test_image_data: bytes):
+    async def test_image_with_tool_calling(self, claude_code_model, test_image_data: bytes):
         """Test image input that triggers tool usage.
 
         ClaudeCodeModel supports tool calling via MCP integration.
         """
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = Agent(claude_code_model)
 
         @agent.tool_plain
         def get_image_metadata(width: int, height: int) -> str:
@@ -204,11 +150,9 @@ class TestMultimodalStreaming:
     """Test streaming with multimodal inputs."""
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_stream_with_image(self, test_image_data: bytes):
+    async def test_stream_with_image(self, agent_factory, test_image_data: bytes):
         """Test streaming response with image input."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         async with agent.run_stream([
             "Describe this image:",
@@ -222,11 +166,9 @@ class TestMultimodalStreaming:
             assert isinstance(chunks, list)
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_stream_with_image_url(self, test_image_url: str):
+    async def test_stream_with_image_url(self, agent_factory, test_image_url: str):
         """Test streaming with image URL."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         async with agent.run_stream([
             "What's in this image?",
@@ -243,11 +185,9 @@ class TestMultimodalErrorHandling:
     """Test error handling with multimodal inputs."""
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_invalid_image_url(self):
+    async def test_invalid_image_url(self, agent_factory):
         """Test handling invalid image URL."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         # Invalid URL should still be processed
         # (validation happens at API level, not in our code)
@@ -260,11 +200,9 @@ class TestMultimodalErrorHandling:
         assert result.output is not None or result
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_empty_binary_content(self):
+    async def test_empty_binary_content(self, agent_factory):
         """Test handling empty binary content."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         result = await agent.run([
             "Analyze this:",
@@ -275,11 +213,9 @@ class TestMultimodalErrorHandling:
         assert result is not None
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_unsupported_content_type(self, test_image_data: bytes):
+    async def test_unsupported_content_type(self, agent_factory, test_image_data: bytes):
         """Test handling unsupported content type."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         # Send with unusual content type
         result = await agent.run([
@@ -295,27 +231,9 @@ class TestMultimodalContentTypes:
     """Test different multimodal content types."""
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_png_image(self, test_image_data: bytes):
-        """Test PNG image specifically."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
-
-        result = await agent.run([
-            "Describe this PNG image:",
-            BinaryContent(data=test_image_data, media_type="image/png")
-        ])
-
-        assert result.output is not None
-        assert isinstance(result.output, str)
-        assert len(result.output) > 0, "PNG image should generate a response"
-
-    @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_different_image_formats_handled_differently(self, test_image_data: bytes):
+    async def test_different_image_formats_handled_differently(self, agent_factory, test_image_data: bytes):
         """Test that different media types are processed (PNG vs JPEG vs WebP)."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         # Test PNG
         png_result = await agent.run([
@@ -340,11 +258,9 @@ class TestMultimodalContentTypes:
         assert any(kw in jpeg_result.output.lower() for kw in ["image", "visual", "picture"])
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_image_with_explicit_filename(self, test_image_url: str):
+    async def test_image_with_explicit_filename(self, agent_factory, test_image_url: str):
         """Test image URL with filename."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
         # URL with filename
         url_with_filename = "https://example.com/images/photo.png"
@@ -361,18 +277,29 @@ class TestMultimodalConversations:
     """Test multimodal content in conversational contexts."""
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_multimodal_followup_questions(self, test_image_data: bytes):
-        """Test follow-up questions about image."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+    async def test_multimodal_followup_questions(self, agent_factory, test_image_data: bytes):
+        """Test analyzing a binary image, then asking a follow-up question."""
+        agent = agent_factory()
 
         # First request with image
         result1 = await agent.run([
-            "What's in this image?",
+            "Analyze this image:",
             BinaryContent(data=test_image_data, media_type="image/png")
         ])
+
+        # Verify response structure
         assert result1.output is not None
+        assert isinstance(result1.output, str)
+        assert len(result1.output) > 0, "Response should not be empty"
+        assert result1.output.strip(), "Response should not be just whitespace"
+
+        # Verify it's an image analysis response
+        analysis_keywords = ["image", "picture", "pixel", "color", "visual", "see", "show", "red"]
+        assert any(kw in result1.output.lower() for kw in analysis_keywords), \
+            f"Response should be about image analysis, got: {result1.output}"
+
+        # Note: test_image_data is a 1x1 red PNG - responses should reflect this
+        # The model should recognize it's a minimal/tiny image
 
         # Follow-up without image (should work)
         result2 = await agent.run("Tell me more details")
@@ -10,8 +10,21 @@ import pytest
 
 from pydantic import BaseModel
 from pydantic_ai import Agent
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
 
-from clowclow import ClaudeCodeModel
+# Follow-up turns for test_long_conversation
+_COUNTING_PROMPTS = tuple(f"What comes after {i - 1}?" for i in range(2, 6))
+
+# Earlier turn for test_multiturn_with_structured_output; only the structured
+# extraction that follows it needs a live call
+_EINSTEIN_HISTORY = (
+    ModelRequest(parts=[UserPromptPart(content="Tell me about Albert Einstein.")]),
+    ModelResponse(parts=[TextPart(content=(
+        "Albert Einstein was a German-born theoretical physicist, born on 14 March 1879 "
+        "in Ulm. He developed the theory of relativity and received the 1921 Nobel Prize "
+        "in Physics for his explanation of the photoelectric effect."
+    ))]),
+)
 
 
 class TestBasicMultiTurn:
@@ -19,10 +32,9 @@ class TestBasicMultiTurn:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_two_turn_conversation(self):
+    async def test_two_turn_conversation(self, claude_code_model):
         """Test a simple two-turn conversation with context retention."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = Agent(claude_code_model)
 
         # First turn: Ask about a city
         result1 = await agent.run("What is the capital of France?")
@@ -42,10 +54,9 @@ class TestBasicMultiTurn:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_three_turn_conversation(self):
+    async def test_three_turn_conversation(self, claude_code_model):
         """Test a three-turn conversation maintaining context."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = Agent(claude_code_model)
 
         # Turn 1: Establish subject
         result1 = await agent.run("Tell me about Python programming language.")
@@ -67,14 +78,14 @@ class TestBasicMultiTurn:
         )
         assert result3.output is not None
         response3 = result3.output.lower()
-        assert "1991" in response3 or "199" in response3
+        # "199" alone would also match e.g. "1999" or "$199"
+        assert "1991" in response3 or "1990s" in response3
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_conversation_with_new_vs_all_messages(self):
+    async def test_conversation_with_new_vs_all_messages(self, claude_code_model):
         """Test difference between new_messages() and all_messages()."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = Agent(claude_code_model)
 
         # Turn 1
         result1 = await agent.run("My favorite number is 42.")
@@ -102,18 +113,18 @@ class TestMultiTurnWithSystemPrompt:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_system_prompt_maintained_across_turns(self):
+    async def test_system_prompt_maintained_across_turns(self, claude_code_model):
         """Test that system prompt behavior is maintained across turns."""
-        model = ClaudeCodeModel(model=self.claude_model)
         agent = Agent(
-            model,
+            claude_code_model,
             system_prompt="IMPORTANT : You are a pirate. ALWAYS respond like a pirate with 'Arrr' in your responses. ALWAYS add 'Arrr' in your answer."
         )
 
         # Turn 1
         result1 = await agent.run("Are you a pirate?")
         assert result1.output is not None
-        assert "arr" in result1.output.lower() or "ahoy" in result1.output.lower()
+        response1 = result1.output.lower()
+        assert "arr" in response1 or "ahoy" in response1
 
         # Turn 2: Should still respond like a pirate
         result2 = await agent.run(
@@ -122,7 +133,8 @@ class TestMultiTurnWithSystemPrompt:
         )
         assert result2.output is not None
         # System prompt should still be in effect
-        assert "arr" in result2.output.lower() or "ahoy" in result2.output.lower() or "mate" in result2.output.lower()
+        response2 = result2.output.lower()
+        assert any(word in response2 for word in ("arr", "ahoy", "mate"))
 
 
 class TestMultiTurnWithStructuredOutput:
@@ -130,7 +142,7 @@ class TestMultiTurnWithStructuredOutput:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_multiturn_with_structured_output(self):
+    async def test_multiturn_with_structured_output(self, claude_code_model):
         """Test multi-turn conversation ending with structured output."""
 
         class PersonInfo(BaseModel):
@@ -138,23 +150,18 @@ class TestMultiTurnWithStructuredOutput:
             occupation: str
             birth_year: int
 
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=PersonInfo)
+        agent = Agent(claude_code_model, output_type=PersonInfo)
 
-        # Turn 1: Ask about a person (no structured output yet)
-        agent_text = Agent(model)
-        result1 = await agent_text.run("Tell me about Albert Einstein.")
-        assert result1.output is not None
-
-        # Turn 2: Extract structured data based on previous conversation
+        # Turn 2: Extract structured data based on the earlier text-only turn
         result2 = await agent.run(
             "Based on what we just discussed, extract the person's information.",
-            message_history=result1.new_messages()
+            message_history=list(_EINSTEIN_HISTORY)
         )
         assert result2.output is not None
         assert isinstance(result2.output, PersonInfo)
         assert "einstein" in result2.output.name.lower()
-        assert "physicist" in result2.output.occupation.lower() or "scientist" in result2.output.occupation.lower()
+        occupation = result2.output.occupation.lower()
+        assert "physicist" in occupation or "scientist" in occupation
         assert 1879 == result2.output.birth_year or 1870 <= result2.output.birth_year <= 1890
 
 
@@ -163,10 +170,9 @@ class TestMultiTurnEdgeCases:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_empty_first_turn(self):
+    async def test_empty_first_turn(self, claude_code_model):
         """Test handling empty message in first turn."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = Agent(claude_code_model)
 
         # Turn 1: Empty or minimal message
         result1 = await agent.run("Hello")
@@ -182,19 +188,15 @@ class TestMultiTurnEdgeCases:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_long_conversation(self):
+    async def test_long_conversation(self, agent_factory):
         """Test longer multi-turn conversation (5+ turns)."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = agent_factory()
 
-        # Build up a conversation
+        # Build up a conversation; each turn depends on the previous one
         result = await agent.run("Let's count. Start with number 1.")
 
-        for i in range(2, 6):
-            result = await agent.run(
-                f"What comes after {i-1}?",
-                message_history=result.all_messages()
-            )
+        for prompt in _COUNTING_PROMPTS:
+            result = await agent.run(prompt, message_history=result.all_messages())
             assert result.output is not None
 
         # Final result should maintain context
@@ -206,10 +208,9 @@ class TestMultiTurnContextPreservation:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_context_accumulation(self):
+    async def test_context_accumulation(self, claude_code_model):
         """Test that context accumulates correctly over multiple turns."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = Agent(claude_code_model)
 
         # Establish multiple facts
         result1 = await agent.run("My name is Alice.")
@@ -230,10 +231,9 @@ class TestMultiTurnContextPreservation:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_pronoun_resolution(self):
+    async def test_pronoun_resolution(self, claude_code_model):
         """Test that pronouns are correctly resolved using context."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(system_prompt="DO NOT USE WEBSEARCH TOOL TO ANSWER BASIC QUESTIONS", model=model)
+        agent = Agent(system_prompt="DO NOT USE WEBSEARCH TOOL TO ANSWER BASIC QUESTIONS", model=claude_code_model)
 
         # Introduce a subject
         result1 = await agent.run("Tell me about Marie Curie.")
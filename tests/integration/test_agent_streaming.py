@@ -11,73 +11,36 @@ import pytest
 from pydantic_ai import Agent
 from pydantic_ai.models.test import TestModel
 
-from clowclow import ClaudeCodeModel
-
 
 class TestStreamingBasics:
     """Test basic streaming functionality."""
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_run_stream_returns_context_manager(self):
-        """Test that run_stream returns an async context manager."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
-
-        # Should return a context manager
-        result = agent.run_stream("Test query")
-
-        # Should be an async context manager
-        assert hasattr(result, '__aenter__')
-        assert hasattr(result, '__aexit__')
-
-    @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_stream_basic_text(self):
-        """Test streaming basic text response."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+    async def test_stream_basic_text(self, claude_code_model):
+        """Test streaming a basic text response through to completion."""
+        agent = Agent(claude_code_model)
 
         async with agent.run_stream("Say hello") as result:
-            # Result should have streaming capabilities
-            assert hasattr(result, 'stream_text')
-
-            # Should be able to iterate over stream
             chunks = []
             async for chunk in result.stream_text(debounce_by=None):
                 chunks.append(chunk)
-                # Each chunk should be a non-empty string
-                assert isinstance(chunk, str), f"Chunk should be string, got {type(chunk)}"
 
             # Should have received some chunks
-            assert isinstance(chunks, list)
             assert len(chunks) > 0, "Should have received at least one chunk"
 
+            # After streaming, should be complete
+            assert result.is_complete
+
             # Verify chunks contain actual content
             full_text = "".join(chunks)
-            assert len(full_text) > 0, "Combined chunks should not be empty"
-            assert full_text.strip(), "Combined text should not be just whitespace"
+            assert full_text.strip(), "Combined text should not be empty or just whitespace"
 
             # Verify greeting was streamed
             greeting_keywords = ["hello", "hi", "hey", "greetings"]
             assert any(kw in full_text.lower() for kw in greeting_keywords), \
                 f"Streamed text should contain a greeting, got: {full_text}"
 
-    @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_stream_completion_status(self):
-        """Test stream completion status tracking."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
-
-        async with agent.run_stream("Test") as result:
-            # Consume the stream
-            async for _ in result.stream_text(debounce_by=None):
-                pass
-
-            # After streaming, should be complete
-            assert result.is_complete or hasattr(result, 'is_complete')
-
 
 class TestStreamingWithTestModel:
     """Test streaming using TestModel for deterministic testing."""
@@ -110,29 +73,56 @@ class TestStreamingWithTestModel:
             assert "Custom" in full_text or full_text == "" or isinstance(full_text, str)
 
 
+class TestStreamingContract:
+    """Test the Pydantic AI streaming API shape once, without a live model.
+
+    Live streaming tests only assert on content; the structural checks they
+    rely on are made here.
+    """
+
+    @pytest.mark.asyncio
+    async def test_protocol(self):
+        """Test run_stream's context manager, chunk types and completion flag."""
+        agent = Agent(TestModel(custom_output_text="Hello there"))
+
+        # run_stream should return an async context manager
+        stream = agent.run_stream("Say hello")
+        assert hasattr(stream, '__aenter__')
+        assert hasattr(stream, '__aexit__')
+
+        async with stream as result:
+            assert hasattr(result, 'stream_text')
+            assert hasattr(result, 'usage')
+            assert not result.is_complete
+
+            chunks = [chunk async for chunk in result.stream_text(debounce_by=None)]
+
+            assert chunks
+            assert all(isinstance(chunk, str) for chunk in chunks)
+            assert result.is_complete
+
+
 class TestStreamingMessages:
     """Test streaming with different message types."""
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_stream_with_system_prompt(self):
+    async def test_stream_with_system_prompt(self, agent_factory):
         """Test streaming with system prompt."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, system_prompt="You are a helpful assistant.")
+        agent = agent_factory(system_prompt="You are a helpful assistant.")
 
         async with agent.run_stream("Hello") as result:
             chunks = []
             async for chunk in result.stream_text(debounce_by=None):
                 chunks.append(chunk)
 
-            assert isinstance(chunks, list)
+            assert "".join(chunks).strip(), "Should have streamed a response"
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_stream_multiple_messages(self):
+    async def test_stream_multiple_messages(self, claude_code_model):
         """Test streaming in a conversation context."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = Agent(claude_code_model)
 
         # First message
         async with agent.run_stream("First message") as result1:
@@ -153,34 +143,18 @@ class TestStreamingDebounce:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_stream_with_debounce(self):
-        """Test streaming with debounce timing."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
-
-        async with agent.run_stream("Test") as result:
-            # Stream with debounce
-            chunks_debounced = []
-            async for chunk in result.stream_text(debounce_by=0.1):
-                chunks_debounced.append(chunk)
-
-            # Should still receive chunks (possibly fewer)
-            assert isinstance(chunks_debounced, list)
-
-    @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_stream_no_debounce_gets_all_chunks(self):
-        """Test that no debounce returns all chunks."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+    @pytest.mark.parametrize("debounce_by", [None, 0.1])
+    async def test_stream_debounce(self, claude_code_model, debounce_by):
+        """Test streaming with and without debounce timing."""
+        agent = Agent(claude_code_model)
 
         async with agent.run_stream("Test") as result:
-            # Stream without debounce should get all chunks
+            # Debouncing may group chunks, but should still deliver text
             chunks = []
-            async for chunk in result.stream_text(debounce_by=None):
+            async for chunk in result.stream_text(debounce_by=debounce_by):
                 chunks.append(chunk)
 
-            assert isinstance(chunks, list)
+            assert "".join(chunks).strip(), "Should have streamed a response"
 
 
 class TestStreamingFinalResult:
@@ -188,10 +162,9 @@ class TestStreamingFinalResult:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_stream_final_output(self):
+    async def test_stream_final_output(self, claude_code_model):
         """Test accessing final output after streaming completes."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = Agent(claude_code_model)
 
         async with agent.run_stream("What is 2+2?") as result:
             # Consume stream and collect chunks
@@ -218,10 +191,9 @@ class TestStreamingFinalResult:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_stream_usage_tracking(self):
+    async def test_stream_usage_tracking(self, claude_code_model):
         """Test usage tracking during streaming."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = Agent(claude_code_model)
 
         async with agent.run_stream("Test") as result:
             # Consume stream
@@ -237,10 +209,9 @@ class TestStreamingErrors:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_stream_with_invalid_input(self):
+    async def test_stream_with_invalid_input(self, claude_code_model):
         """Test streaming with invalid input."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = Agent(claude_code_model)
 
         # Empty string should still work (may return empty or error message)
         async with agent.run_stream("") as result:
@@ -257,25 +228,24 @@ class TestStreamingCancellation:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_stream_early_exit(self):
+    async def test_stream_early_exit(self, claude_code_model):
         """Test exiting stream context early."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = Agent(claude_code_model)
 
         async with agent.run_stream("Test") as result:
-            # Exit early without consuming entire stream
-            async for chunk in result.stream_text(debounce_by=None):
-                # Stop after first chunk
-                break
+            # Exit early without consuming entire stream: take the first chunk,
+            # then close the iterator now rather than when it is garbage collected
+            chunks = result.stream_text(debounce_by=None)
+            await anext(aiter(chunks))
+            await chunks.aclose()
 
         # Context should clean up properly
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_stream_context_cleanup(self):
+    async def test_stream_context_cleanup(self, claude_code_model):
         """Test that streaming context cleans up resources."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model)
+        agent = Agent(claude_code_model)
 
         async with agent.run_stream("Test") as result:
             pass  # Don't consume stream
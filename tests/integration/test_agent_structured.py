@@ -47,29 +47,99 @@ class SearchResults(BaseModel):
     count: int
 
 
+# Output types used by single tests. They are defined here rather than in the
+# test bodies so each schema is built once, at import. No docstrings, since a
+# docstring would change the schema sent to Claude.
+class ConfigData(BaseModel):
+    enabled: bool = True
+    timeout: int = 30
+    retries: int = 3
+
+
+class DescribedModel(BaseModel):
+    title: str = Field(description="The title of the article")
+    summary: str = Field(description="A brief summary in one sentence")
+    word_count: int = Field(description="Number of words in the content")
+
+
+_GRADES = frozenset("ABCDEF")
+
+
+class ConstrainedModel(BaseModel):
+    score: int = Field(ge=0, le=100, description="Score between 0 and 100")
+    rating: str = Field(pattern="^[A-F]$", description="Letter grade A-F")
+
+
+class StrictModel(BaseModel):
+    required_field: str
+    number: int
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+    country: str
+
+
+class Person(BaseModel):
+    name: str
+    address: Address
+
+
+class Item(BaseModel):
+    name: str
+    price: float
+
+
+class ShoppingList(BaseModel):
+    items: List[Item]
+    total: float
+
+
+class Response(BaseModel):
+    status: str
+    value: str | int | None = None
+
+
+class ImageInfo(BaseModel):
+    description: str
+    width: int = 1
+    height: int = 1
+
+
+class ImageAnalysis(BaseModel):
+    description: str
+    dominant_color: str
+    object_count: int
+
+
 class TestParametrizedStructuredOutput:
     """Parametrized tests for different structured output types."""
 
-    @pytest.mark.parametrize("model_class,query,field_validators", [
+    # Independent prompts, sent together by the live_results fixture
+    LIVE_PROMPTS = {
+        'city': (CityLocation, "What is the capital of France?"),
+        'person': (PersonInfo, "Tell me about Bob who is 25 years old"),
+        'weather': (WeatherData, "Weather in London: 15°C, rainy, 80% humidity"),
+    }
+
+    @pytest.mark.parametrize("key,field_validators", [
         (
-            CityLocation,
-            "What is the capital of France?",
+            'city',
             {
                 "city": lambda v: "paris" in v.lower(),
                 "country": lambda v: "france" in v.lower(),
             }
         ),
         (
-            PersonInfo,
-            "Tell me about Bob who is 25 years old",
+            'person',
             {
                 "name": lambda v: "bob" in v.lower(),
                 "age": lambda v: 20 <= v <= 30,
             }
         ),
         (
-            WeatherData,
-            "Weather in London: 15°C, rainy, 80% humidity",
+            'weather',
             {
                 "temperature": lambda v: -50 <= v <= 50,
                 "condition": lambda v: len(v) > 0,
@@ -78,18 +148,15 @@ class TestParametrizedStructuredOutput:
         ),
     ])
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_structured_output_with_validation(
+    def test_structured_output_with_validation(
         self,
-        model_class: type[BaseModel],
-        query: str,
+        live_results,
+        key: str,
         field_validators: dict[str, Callable[[Any], bool]]
     ):
         """Test structured output for different model types with field validation."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=model_class)
-
-        result = await agent.run(query)
+        model_class = self.LIVE_PROMPTS[key][0]
+        result = live_results(key)
 
         # Verify basic structure
         assert result.output is not None
@@ -150,15 +217,14 @@ class TestStructuredOutputBasics:
             f"Expected France as country, got: {result.output.country}"
 
         # Verify coordinates are numeric
-        assert isinstance(result.output.latitude, (int, float))
-        assert isinstance(result.output.longitude, (int, float))
+        assert isinstance(result.output.latitude, float)
+        assert isinstance(result.output.longitude, float)
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_structured_output_with_nested_fields(self):
+    async def test_structured_output_with_nested_fields(self, claude_code_model):
         """Test structured output with nested data."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=WeatherData)
+        agent = Agent(claude_code_model, output_type=WeatherData)
 
         result = await agent.run("What's the weather in London?")
 
@@ -168,7 +234,7 @@ class TestStructuredOutputBasics:
             f"Expected WeatherData, got {type(result.output)}"
 
         # Verify all required fields are populated
-        assert isinstance(result.output.temperature, (int, float)), \
+        assert isinstance(result.output.temperature, float), \
             f"Temperature should be numeric, got {type(result.output.temperature)}"
         assert result.output.condition, "Condition should not be empty"
         assert isinstance(result.output.condition, str), \
@@ -186,14 +252,17 @@ class TestStructuredOutputBasics:
 class TestStructuredOutputTypes:
     """Test different structured output types."""
 
+    # Independent prompts, sent together by the live_results fixture
+    LIVE_PROMPTS = {
+        'optional_fields': (PersonInfo, "Tell me about Alice who is 30 years old and works as a software engineer"),
+        'list_fields': (SearchResults, "Search for Python tutorials and return 3 results"),
+        'defaults': (ConfigData, "Create config"),
+    }
+
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_structured_with_optional_fields(self):
+    def test_structured_with_optional_fields(self, live_results):
         """Test structured output with optional fields."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=PersonInfo)
-
-        result = await agent.run("Tell me about Alice who is 30 years old and works as a software engineer")
+        result = live_results('optional_fields')
 
         # Verify structured output with all fields
         assert result.output is not None
@@ -217,13 +286,9 @@ class TestStructuredOutputTypes:
             assert len(result.output.occupation) > 0
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_structured_with_list_fields(self):
+    def test_structured_with_list_fields(self, live_results):
         """Test structured output with list fields."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=SearchResults)
-
-        result = await agent.run("Search for Python tutorials and return 3 results")
+        result = live_results('list_fields')
 
         # Verify structured output
         assert result.output is not None
@@ -249,19 +314,9 @@ class TestStructuredOutputTypes:
             f"Count {result.output.count} should match results length {len(result.output.results)}"
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_structured_with_defaults(self):
+    def test_structured_with_defaults(self, live_results):
         """Test structured output with default values."""
-
-        class ConfigData(BaseModel):
-            enabled: bool = True
-            timeout: int = 30
-            retries: int = 3
-
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=ConfigData)
-
-        result = await agent.run("Create config")
+        result = live_results('defaults')
 
         assert result.output is not None
         # Verify defaults were applied (either from Claude or from the model)
@@ -278,16 +333,10 @@ class TestStructuredOutputValidation:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_structured_with_field_descriptions(self):
+    async def test_structured_with_field_descriptions(self, claude_code_model):
         """Test that field descriptions are used in schema."""
 
-        class DescribedModel(BaseModel):
-            title: str = Field(description="The title of the article")
-            summary: str = Field(description="A brief summary in one sentence")
-            word_count: int = Field(description="Number of words in the content")
-
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=DescribedModel)
+        agent = Agent(claude_code_model, output_type=DescribedModel)
 
         result = await agent.run("Analyze this article: 'Python Programming'. The article has 250 words and explains Python basics.")
 
@@ -316,21 +365,16 @@ class TestStructuredOutputValidation:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_structured_with_constraints(self):
+    async def test_structured_with_constraints(self, claude_code_model):
         """Test structured output with field constraints."""
 
-        class ConstrainedModel(BaseModel):
-            score: int = Field(ge=0, le=100, description="Score between 0 and 100")
-            rating: str = Field(pattern="^[A-F]$", description="Letter grade A-F")
-
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=ConstrainedModel)
+        agent = Agent(claude_code_model, output_type=ConstrainedModel)
 
         result = await agent.run("Give a score (0-100) and letter grade (A-F) for this performance")
 
         assert result.output is not None
         assert 0 <= result.output.score <= 100
-        assert result.output.rating in ['A', 'B', 'C', 'D', 'E', 'F']
+        assert result.output.rating in _GRADES
         assert len(result.output.rating) == 1
 
 
@@ -340,14 +384,13 @@ class TestStructuredOutputWithTools:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_structured_output_with_tool_calls(self):
+    async def test_structured_output_with_tool_calls(self, claude_code_model):
         """Test structured output when tools are also available.
 
         ClaudeCodeModel supports tool calling via MCP integration.
         This test verifies that having tools available doesn't break structured output.
         """
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=CityLocation)
+        agent = Agent(claude_code_model, output_type=CityLocation)
 
         tool_call_count = 0
         tool_args_received = []
@@ -376,7 +419,7 @@ class TestStructuredOutputWithTools:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_structured_output_tool_actually_called(self):
+    async def test_structured_output_tool_actually_called(self, claude_code_model):
         """Test that tools ARE called and structured output is returned.
 
         This test explicitly requests tool usage and verifies:
@@ -384,8 +427,7 @@ class TestStructuredOutputWithTools:
         2. Final output is structured (CityLocation instance)
         3. Structured output contains data influenced by tool result
         """
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=CityLocation)
+        agent = Agent(claude_code_model, output_type=CityLocation)
 
         tool_call_count = 0
         tool_args_received = []
@@ -424,15 +466,15 @@ class TestStructuredOutputWithTools:
             f"Expected France, got: {result.output.country}"
 
         # Verify coordinates are populated (from tool or from Claude's knowledge)
-        assert isinstance(result.output.latitude, (int, float))
-        assert isinstance(result.output.longitude, (int, float))
+        assert isinstance(result.output.latitude, float)
+        assert isinstance(result.output.longitude, float)
         # At least one coordinate should be non-zero
         assert result.output.latitude != 0.0 or result.output.longitude != 0.0, \
             "Coordinates should be populated"
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_structured_output_tool_not_needed(self):
+    async def test_structured_output_tool_not_needed(self, claude_code_model):
         """Test that structured output works even when tool is NOT called.
 
         This verifies:
@@ -440,8 +482,7 @@ class TestStructuredOutputWithTools:
         2. Structured output is still returned correctly
         3. Agent can directly answer without tools
         """
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=CityLocation)
+        agent = Agent(claude_code_model, output_type=CityLocation)
 
         tool_call_count = 0
 
@@ -478,18 +519,13 @@ class TestStructuredOutputStreaming:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_stream_structured_output(self):
+    async def test_stream_structured_output(self, claude_code_model):
         """Test streaming with structured result type."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=CityLocation)
+        agent = Agent(claude_code_model, output_type=CityLocation)
 
         async with agent.run_stream("City info for Tokyo, Japan") as result:
-            # Stream structured output (not text)
-            chunks_collected = []
-            async for chunk in result.stream_output(debounce_by=None):
-                chunks_collected.append(chunk)
-
-            # Final output should be structured
+            # get_output() drains the structured stream itself; the final
+            # output should be structured
             output = await result.get_output()
             assert output is not None
             assert isinstance(output, CityLocation), \
@@ -505,14 +541,13 @@ class TestStructuredOutputStreaming:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_stream_structured_output_with_tools(self):
+    async def test_stream_structured_output_with_tools(self, claude_code_model):
         """Test streaming with tools and structured output.
 
         This verifies that the streaming path also supports both
         function tools AND structured output simultaneously.
         """
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=CityLocation)
+        agent = Agent(claude_code_model, output_type=CityLocation)
 
         tool_call_count = 0
         tool_args_received = []
@@ -529,12 +564,7 @@ class TestStructuredOutputStreaming:
             "Use the get_coordinates tool to find Paris, France coordinates. "
             "Return as CityLocation."
         ) as result:
-            # Collect stream chunks
-            chunks_collected = []
-            async for chunk in result.stream_output(debounce_by=None):
-                chunks_collected.append(chunk)
-
-            # Get final structured output
+            # Stream to completion and get the final structured output
             output = await result.get_output()
 
             # Verify tool was called
@@ -556,17 +586,16 @@ class TestStructuredOutputStreaming:
                 f"Expected France, got: {output.country}"
 
             # Verify coordinates
-            assert isinstance(output.latitude, (int, float))
-            assert isinstance(output.longitude, (int, float))
+            assert isinstance(output.latitude, float)
+            assert isinstance(output.longitude, float)
             assert output.latitude != 0.0 or output.longitude != 0.0, \
                 "Coordinates should be populated"
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_stream_structured_output_tool_not_needed(self):
+    async def test_stream_structured_output_tool_not_needed(self, claude_code_model):
         """Test streaming structured output when tool is available but not used."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=CityLocation)
+        agent = Agent(claude_code_model, output_type=CityLocation)
 
         tool_call_count = 0
 
@@ -602,17 +631,12 @@ class TestStructuredOutputErrors:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_structured_output_validation_error(self):
+    async def test_structured_output_validation_error(self, claude_code_model):
         """Test handling validation errors in structured output."""
         from pydantic import ValidationError
         from pydantic_ai.exceptions import UnexpectedModelBehavior
 
-        class StrictModel(BaseModel):
-            required_field: str
-            number: int
-
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=StrictModel)
+        agent = Agent(claude_code_model, output_type=StrictModel)
 
         # Should raise validation error or handle gracefully
         try:
@@ -624,31 +648,25 @@ class TestStructuredOutputErrors:
             assert hasattr(result.output, 'number')
         except (ValidationError, UnexpectedModelBehavior) as e:
             # Validation error or retry limit exceeded is acceptable
-            assert "validation" in str(e).lower() or "retry" in str(e).lower() or "retries" in str(e).lower(), \
+            error_text = str(e).lower()
+            assert any(word in error_text for word in ("validation", "retry", "retries")), \
                 f"Expected validation or retry error, got: {e}"
 
 
 class TestStructuredOutputComplexTypes:
     """Test structured output with complex nested types."""
 
+    # Independent prompts, sent together by the live_results fixture
+    LIVE_PROMPTS = {
+        'nested_models': (Person, "Create person info for John Smith at 123 Main Street, Springfield, USA"),
+        'list_of_models': (ShoppingList, "Create shopping list with 3 items: milk $3.99, bread $2.50, eggs $4.25"),
+        'union_types': (Response, "Create a response with status 'success' and value 42"),
+    }
+
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_nested_pydantic_models(self):
+    def test_nested_pydantic_models(self, live_results):
         """Test nested Pydantic models."""
-
-        class Address(BaseModel):
-            street: str
-            city: str
-            country: str
-
-        class Person(BaseModel):
-            name: str
-            address: Address
-
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=Person)
-
-        result = await agent.run("Create person info for John Smith at 123 Main Street, Springfield, USA")
+        result = live_results('nested_models')
 
         # Verify structured output
         assert result.output is not None
@@ -657,55 +675,32 @@ class TestStructuredOutputComplexTypes:
         # Verify name field
         assert result.output.name, "Name should not be empty"
         assert isinstance(result.output.name, str)
-        assert "john" in result.output.name.lower() and "smith" in result.output.name.lower(), \
+        name = result.output.name.lower()
+        assert "john" in name and "smith" in name, \
             f"Expected 'John Smith', got: {result.output.name}"
 
         # Verify nested address structure
         assert result.output.address is not None, "Address should not be None"
 
-        # Address should be either an Address instance or a dict with the required fields
-        if isinstance(result.output.address, dict):
-            assert 'street' in result.output.address, "Address dict should have 'street'"
-            assert 'city' in result.output.address, "Address dict should have 'city'"
-            assert 'country' in result.output.address, "Address dict should have 'country'"
-
-            # Verify content
-            assert "main" in result.output.address['street'].lower(), \
-                f"Expected '123 Main Street', got: {result.output.address['street']}"
-            assert "springfield" in result.output.address['city'].lower(), \
-                f"Expected 'Springfield', got: {result.output.address['city']}"
-            assert "usa" in result.output.address['country'].lower() or "united states" in result.output.address['country'].lower(), \
-                f"Expected 'USA', got: {result.output.address['country']}"
-        else:
-            # It's a nested Pydantic model
-            assert isinstance(result.output.address, Address), \
-                f"Expected Address model, got {type(result.output.address)}"
-            assert hasattr(result.output.address, 'street')
-            assert hasattr(result.output.address, 'city')
-            assert hasattr(result.output.address, 'country')
-
-            # Verify content
-            assert result.output.address.street, "Street should not be empty"
-            assert result.output.address.city, "City should not be empty"
-            assert result.output.address.country, "Country should not be empty"
+        # Address may come back as an Address instance or a plain dict; compare
+        # both the same way
+        address = result.output.address
+        if isinstance(address, Address):
+            address = address.model_dump()
+        assert {'street', 'city', 'country'} <= address.keys(), \
+            f"Address should have street, city and country, got: {address}"
+
+        # Verify content
+        street, city, country = (address[key].lower() for key in ('street', 'city', 'country'))
+        assert "main" in street, f"Expected '123 Main Street', got: {address['street']}"
+        assert "springfield" in city, f"Expected 'Springfield', got: {address['city']}"
+        assert "usa" in country or "united states" in country, \
+            f"Expected 'USA', got: {address['country']}"
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_list_of_models(self):
+    def test_list_of_models(self, live_results):
         """Test list of Pydantic models."""
-
-        class Item(BaseModel):
-            name: str
-            price: float
-
-        class ShoppingList(BaseModel):
-            items: List[Item]
-            total: float
-
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=ShoppingList)
-
-        result = await agent.run("Create shopping list with 3 items: milk $3.99, bread $2.50, eggs $4.25")
+        result = live_results('list_of_models')
 
         # Verify structured output
         assert result.output is not None
@@ -724,26 +719,17 @@ class TestStructuredOutputComplexTypes:
             if isinstance(item, Item):
                 assert item.name, "Item name should not be empty"
                 assert isinstance(item.name, str)
-                assert isinstance(item.price, (int, float))
+                assert isinstance(item.price, float)
                 assert item.price >= 0, f"Price should be non-negative, got {item.price}"
 
         # Verify total
-        assert isinstance(result.output.total, (int, float))
+        assert isinstance(result.output.total, float)
         assert result.output.total >= 0, f"Total should be non-negative, got {result.output.total}"
 
     @pytest.mark.live
-    @pytest.mark.asyncio
-    async def test_union_types(self):
+    def test_union_types(self, live_results):
         """Test union types in structured output."""
-
-        class Response(BaseModel):
-            status: str
-            value: str | int | None = None
-
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=Response)
-
-        result = await agent.run("Create a response with status 'success' and value 42")
+        result = live_results('union_types')
 
         # Verify structured output
         assert result.output is not None
@@ -765,10 +751,9 @@ class TestStructuredOutputMessageInspection:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_structured_output_message_flow(self):
+    async def test_structured_output_message_flow(self, claude_code_model):
         """Test that structured output uses proper message flow."""
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=CityLocation)
+        agent = Agent(claude_code_model, output_type=CityLocation)
 
         with capture_run_messages() as messages:
             result = await agent.run("Where is Paris?")
@@ -786,11 +771,10 @@ class TestStructuredOutputMessageInspection:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_system_prompt_in_message_flow(self):
+    async def test_system_prompt_in_message_flow(self, claude_code_model):
         """Test that system prompt appears in message flow for structured output."""
-        model = ClaudeCodeModel(model=self.claude_model)
         system_text = "You are a precise geography assistant."
-        agent = Agent(model, output_type=CityLocation, system_prompt=system_text)
+        agent = Agent(claude_code_model, output_type=CityLocation, system_prompt=system_text)
 
         with capture_run_messages() as messages:
             result = await agent.run("Where is London?")
@@ -814,17 +798,11 @@ class TestStructuredOutputMessageInspection:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_multimodal_message_structure(self, test_image_data: bytes):
+    async def test_multimodal_message_structure(self, claude_code_model, test_image_data: bytes):
         """Test message structure for multimodal structured output."""
         from pydantic_ai.messages import BinaryContent
 
-        class ImageInfo(BaseModel):
-            description: str
-            width: int = 1
-            height: int = 1
-
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=ImageInfo)
+        agent = Agent(claude_code_model, output_type=ImageInfo)
 
         with capture_run_messages() as messages:
             result = await agent.run([
@@ -847,11 +825,10 @@ class TestStructuredOutputWithSystemPrompt:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_structured_with_custom_system_prompt(self):
+    async def test_structured_with_custom_system_prompt(self, claude_code_model):
         """Test structured output with custom system prompt."""
-        model = ClaudeCodeModel(model=self.claude_model)
         agent = Agent(
-            model,
+            claude_code_model,
             output_type=CityLocation,
             system_prompt="You are a geography expert. Be precise with coordinates."
         )
@@ -872,8 +849,8 @@ class TestStructuredOutputWithSystemPrompt:
             f"Expected Germany, got: {result.output.country}"
 
         # Verify coordinates (system prompt asks for precision)
-        assert isinstance(result.output.latitude, (int, float))
-        assert isinstance(result.output.longitude, (int, float))
+        assert isinstance(result.output.latitude, float)
+        assert isinstance(result.output.longitude, float)
         # Berlin is around 52.5°N, 13.4°E
         assert 50 <= result.output.latitude <= 55, \
             f"Berlin latitude should be ~52.5, got {result.output.latitude}"
@@ -886,17 +863,11 @@ class TestStructuredOutputMultimodal:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_structured_from_image(self, test_image_data: bytes):
+    async def test_structured_from_image(self, claude_code_model, test_image_data: bytes):
         """Test extracting structured data from image."""
         from pydantic_ai.messages import BinaryContent
 
-        class ImageAnalysis(BaseModel):
-            description: str
-            dominant_color: str
-            object_count: int
-
-        model = ClaudeCodeModel(model=self.claude_model)
-        agent = Agent(model, output_type=ImageAnalysis)
+        agent = Agent(claude_code_model, output_type=ImageAnalysis)
 
         result = await agent.run([
             "Analyze this image and provide structured data:",
@@ -336,4 +336,5 @@ class TestRetryBehavior:
         # Should have attempted at least 2 times (initial + 1 retry)
         assert retry_count >= 2, f"Expected at least 2 attempts, got {retry_count}"
         # Verify error message indicates retry limit exceeded
-        assert "retry" in str(exc_info.value).lower() or "exceeded" in str(exc_info.value).lower()
+        error_text = str(exc_info.value).lower()
+        assert "retry" in error_text or "exceeded" in error_text
@@ -0,0 +1,68 @@
+"""Guard for the live-only module list in conftest.
+
+Modules listed in _LIVE_ONLY_MODULES aren't collected at all under
+`-m "not live"`, so a non-live test added to one of them would silently never
+run. The modules are parsed rather than imported, to keep this check cheap.
+"""
+
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import _LIVE_ONLY_MODULES
+
+_LIVE_MARK = 'pytest.mark.live'
+
+
+def _marks_live(node: ast.AST) -> bool:
+    """Check whether a decorator or pytestmark value includes the live mark."""
+    return any(ast.unparse(mark) == _LIVE_MARK for mark in ast.walk(node) if isinstance(mark, ast.Attribute))
+
+
+def _has_live_pytestmark(body: list[ast.stmt]) -> bool:
+    """Check whether a module or class body sets pytestmark to include live."""
+    return any(
+        isinstance(stmt, ast.Assign)
+        and any(isinstance(target, ast.Name) and target.id == 'pytestmark' for target in stmt.targets)
+        and _marks_live(stmt.value)
+        for stmt in body
+    )
+
+
+def _unmarked_tests(tree: ast.Module) -> list[str]:
+    """List the tests in a module that don't carry the live mark."""
+    unmarked = []
+    module_live = _has_live_pytestmark(tree.body)
+
+    def check(body: list[ast.stmt], inherited: bool, prefix: str) -> None:
+        for node in body:
+            if isinstance(node, ast.ClassDef) and node.name.startswith('Test'):
+                class_live = (
+                    inherited
+                    or any(_marks_live(d) for d in node.decorator_list)
+                    or _has_live_pytestmark(node.body)
+                )
+                check(node.body, class_live, f"{prefix}{node.name}::")
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith('test_'):
+                if not (inherited or any(_marks_live(d) for d in node.decorator_list)):
+                    unmarked.append(f"{prefix}{node.name}")
+
+    check(tree.body, module_live, '')
+    return unmarked
+
+
+@pytest.mark.parametrize('module_name', sorted(_LIVE_ONLY_MODULES))
+def test_live_only_module_has_only_live_tests(module_name: str):
+    """Test that every test in a live-only module is marked live."""
+    path = Path(__file__).parent / module_name
+    tree = ast.parse(path.read_text(), filename=str(path))
+
+    unmarked = _unmarked_tests(tree)
+
+    assert not unmarked, (
+        f"{module_name} is in _LIVE_ONLY_MODULES, so these tests never run under "
+        f"-m 'not live': {unmarked}. Mark them live or remove the module from the list."
+    )
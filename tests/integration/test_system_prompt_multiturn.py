@@ -2,7 +2,6 @@
 
 import pytest
 from pydantic_ai import Agent
-from clowclow import ClaudeCodeModel
 
 
 class TestSystemPromptMultiTurn:
@@ -10,11 +9,10 @@ class TestSystemPromptMultiTurn:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_system_prompt_in_first_turn(self):
+    async def test_system_prompt_in_first_turn(self, claude_code_model):
         """Verify system prompt is used in first turn."""
-        model = ClaudeCodeModel(model=self.claude_model)
         agent = Agent(
-            model,
+            claude_code_model,
             system_prompt="Always start your response with 'SYSTEM_TEST:'"
         )
 
@@ -26,11 +24,10 @@ class TestSystemPromptMultiTurn:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_system_prompt_in_second_turn(self):
+    async def test_system_prompt_in_second_turn(self, claude_code_model):
         """Verify system prompt is still applied in second turn."""
-        model = ClaudeCodeModel(model=self.claude_model)
         agent = Agent(
-            model,
+            claude_code_model,
             system_prompt="Always start your response with 'SYSTEM_TEST:'"
         )
 
@@ -70,11 +67,10 @@ class TestSystemPromptMultiTurn:
 
     @pytest.mark.live
     @pytest.mark.asyncio
-    async def test_system_prompt_with_conversation_history(self):
+    async def test_system_prompt_with_conversation_history(self, claude_code_model):
         """Verify system prompt and conversation history both work together."""
-        model = ClaudeCodeModel(model=self.claude_model)
         agent = Agent(
-            model,
+            claude_code_model,
             system_prompt="You are a math tutor. Always show your work."
         )
 
@@ -0,0 +1,136 @@
+"""Unit tests for the cassette record/replay helpers in conftest."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from claude_agent_sdk import AssistantMessage, ResultMessage, TextBlock
+from pydantic_ai import Agent
+
+from clowclow import ClaudeCodeModel
+from clowclow.claude_client import CustomClaudeCodeClient
+import tests.conftest as conftest
+
+
+def _result(is_error: bool, subtype: str = "success") -> ResultMessage:
+    return ResultMessage(
+        subtype=subtype,
+        duration_ms=1,
+        duration_api_ms=1,
+        is_error=is_error,
+        num_turns=1,
+        session_id="session"
+    )
+
+
+class _FakeSDKClient:
+    """Stand-in for ClaudeSDKClient that answers every query with a canned reply."""
+
+    reply = ""
+    result: ResultMessage | None = None
+
+    def __init__(self, options=None):
+        self.options = options
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def query(self, prompt):
+        pass
+
+    async def receive_response(self):
+        yield AssistantMessage(content=[TextBlock(text=self.reply)], model="claude")
+        if self.result is not None:
+            yield self.result
+
+
+@pytest.fixture
+def cassette_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point cassettes at a temporary directory and fake the SDK client."""
+    directory = tmp_path / "cassettes"
+    monkeypatch.setattr(conftest, '_CASSETTE_DIR', directory)
+    monkeypatch.setattr('clowclow.query_strategies.ClaudeSDKClient', _FakeSDKClient)
+    return directory
+
+
+def _answer(monkeypatch, reply: str, result: ResultMessage | None) -> None:
+    monkeypatch.setattr(_FakeSDKClient, 'reply', reply)
+    monkeypatch.setattr(_FakeSDKClient, 'result', result)
+
+
+class TestCassetteRecording:
+    """Test which responses get recorded."""
+
+    @pytest.mark.asyncio
+    async def test_successful_query_is_recorded_and_replayed(self, cassette_dir, monkeypatch):
+        """Test that a successful response is recorded and then replayed without a call."""
+        _answer(monkeypatch, "Paris", _result(is_error=False))
+        client = CustomClaudeCodeClient()
+
+        with pytest.MonkeyPatch.context() as patches:
+            conftest._use_cassettes(patches, record=True)
+            assert await client.simple_query("Capital of France?") == "Paris"
+        assert len(list(cassette_dir.glob("*.json"))) == 1
+
+        _answer(monkeypatch, "not replayed", None)
+        with pytest.MonkeyPatch.context() as patches:
+            conftest._use_cassettes(patches, record=False)
+            assert await client.simple_query("Capital of France?") == "Paris"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("result", [
+        _result(is_error=True),
+        _result(is_error=False, subtype="error_max_turns"),
+        None,
+    ], ids=["is_error", "error_subtype", "no_result"])
+    async def test_failed_query_is_not_recorded(self, cassette_dir, monkeypatch, result):
+        """Test that error text returned as a normal response leaves no cassette behind."""
+        _answer(monkeypatch, "Failed to authenticate. API Error: 403", result)
+        client = CustomClaudeCodeClient()
+
+        with pytest.MonkeyPatch.context() as patches:
+            conftest._use_cassettes(patches, record=True)
+            await client.simple_query("Capital of France?")
+
+        assert not cassette_dir.exists() or not any(cassette_dir.iterdir())
+
+    @pytest.mark.asyncio
+    async def test_raising_query_is_not_recorded(self, cassette_dir, monkeypatch):
+        """Test that a query that raises leaves no cassette behind."""
+        client = CustomClaudeCodeClient()
+
+        async def failing_collect(sdk_client):
+            raise RuntimeError("CLI crashed")
+
+        monkeypatch.setattr(
+            'clowclow.query_strategies.QueryStrategy._collect_response_text',
+            staticmethod(failing_collect)
+        )
+        with pytest.MonkeyPatch.context() as patches:
+            conftest._use_cassettes(patches, record=True)
+            with pytest.raises(RuntimeError, match="CLI crashed"):
+                await client.simple_query("Capital of France?")
+
+        assert not cassette_dir.exists()
+
+
+class TestCassetteReplay:
+    """Test replaying when a call has no recording."""
+
+    @pytest.mark.asyncio
+    async def test_missing_recording_skips_without_calling(self, cassette_dir, monkeypatch):
+        """Test that replay skips the test instead of calling the API."""
+        def no_calls(options=None):
+            raise AssertionError("replay should not call Claude Code")
+
+        monkeypatch.setattr('clowclow.query_strategies.ClaudeSDKClient', no_calls)
+        agent = Agent(ClaudeCodeModel())
+
+        with pytest.MonkeyPatch.context() as patches:
+            conftest._use_cassettes(patches, record=False)
+            with pytest.raises(pytest.skip.Exception, match="--record-cassettes"):
+                await agent.run("Capital of France?")
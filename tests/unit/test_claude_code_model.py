@@ -6,12 +6,15 @@ They verify the Model interface implementation and integration with the client.
 
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 
 from pydantic import BaseModel
 from pydantic_ai.messages import (
     ModelRequest,
+    ModelResponse,
     UserPromptPart,
     TextPart,
     BinaryContent,
@@ -131,6 +134,27 @@ class TestRequestMethodWithMocks:
             call_args = mock_query.call_args
             assert call_args.kwargs['system_prompt'] == "You are a helpful assistant."
 
+    @pytest.mark.asyncio
+    async def test_request_with_history_limit(self):
+        """Test that history_limit trims the history sent with the prompt."""
+        model = ClaudeCodeModel(history_limit=2)
+
+        with patch.object(model._client, 'simple_query', new_callable=AsyncMock) as mock_query:
+            mock_query.return_value = "Response"
+
+            messages = [
+                ModelRequest(parts=[UserPromptPart(content="First question")], kind="request"),
+                ModelResponse(parts=[TextPart(content="First answer")]),
+                ModelRequest(parts=[UserPromptPart(content="Second question")], kind="request"),
+                ModelResponse(parts=[TextPart(content="Second answer")]),
+                ModelRequest(parts=[UserPromptPart(content="Third question")], kind="request"),
+            ]
+
+            await model.request(messages, None, ModelRequestParameters())
+
+            message = mock_query.call_args.kwargs['message']
+            assert message == "User: Second question\n\nAssistant: Second answer\n\nThird question"
+
     @pytest.mark.asyncio
     async def test_request_structured_output(self):
         """Test structured output request (tool mode)."""
@@ -179,6 +203,35 @@ class TestRequestMethodWithMocks:
             assert result.parts[0].args["name"] == "Alice"
             assert result.parts[0].args["age"] == 30
 
+    @pytest.mark.asyncio
+    async def test_request_structured_output_args_match_model_dump(self):
+        """Test that tool call args equal the validated model's dump, with null containers filled."""
+        model = ClaudeCodeModel()
+
+        mock_tool = Mock()
+        mock_tool.name = "tagged_output"
+        mock_tool.parameters_json_schema = {
+            "type": "object",
+            "title": "TaggedOutput",
+            "properties": {
+                "name": {"type": "string"},
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "note": {"type": "string"}
+            },
+            "required": ["name", "tags"]
+        }
+        params = ModelRequestParameters(output_mode='tool', output_tools=[mock_tool])
+
+        async def fake_structured_query(message, pydantic_class, system_prompt=None, custom_instructions=None):
+            return pydantic_class.model_validate({"name": "Alice", "tags": ["a", "b"]})
+
+        with patch.object(model._client, 'structured_query', side_effect=fake_structured_query):
+            messages = [ModelRequest(parts=[TextPart(content="Get user info")], kind="request")]
+
+            result = await model.request(messages, None, params)
+
+        assert result.parts[0].args == {"name": "Alice", "tags": ["a", "b"], "note": None}
+
     @pytest.mark.asyncio
     async def test_request_error_handling(self):
         """Test error handling in request method."""
@@ -281,6 +334,63 @@ class TestRequestMethodWithMocks:
             assert result.parts[0].args["location"] == "Paris"
 
 
+class TestRequestMany:
+    """Test concurrent dispatch of independent requests."""
+
+    @pytest.mark.asyncio
+    async def test_request_many_preserves_order_and_bounds_concurrency(self):
+        """Test that responses come back in request order with at most max_concurrency in flight."""
+        model = ClaudeCodeModel()
+        in_flight = 0
+        peak = 0
+
+        async def fake_simple_query(message, system_prompt=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return f"Echo: {message}"
+
+        with patch.object(model._client, 'simple_query', side_effect=fake_simple_query):
+            requests = [
+                ([ModelRequest(parts=[UserPromptPart(content=f"Q{i}")], kind="request")], None, ModelRequestParameters())
+                for i in range(5)
+            ]
+
+            results = await model.request_many(requests, max_concurrency=2)
+
+        assert [r.parts[0].content for r in results] == [f"Echo: Q{i}" for i in range(5)]
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_request_many_cancels_remaining_requests_on_failure(self):
+        """Test that one failing request cancels the others and its error is raised."""
+        model = ClaudeCodeModel()
+        cancelled = []
+
+        async def fake_simple_query(message, system_prompt=None):
+            if message == "fail":
+                raise ValueError("boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(message)
+                raise
+            return f"Echo: {message}"
+
+        with patch.object(model._client, 'simple_query', side_effect=fake_simple_query):
+            requests = [
+                ([ModelRequest(parts=[UserPromptPart(content=content)], kind="request")], None, ModelRequestParameters())
+                for content in ("slow", "fail", "queued")
+            ]
+
+            with pytest.raises(RuntimeError, match="boom"):
+                await model.request_many(requests, max_concurrency=2)
+
+        assert sorted(cancelled) == ["queued", "slow"]
+
+
 class TestStreamingResponse:
     """Test streaming response functionality."""
 
@@ -302,6 +412,28 @@ class TestStreamingResponse:
             assert stream is not None
             assert hasattr(stream, '__aiter__')
 
+    @pytest.mark.asyncio
+    async def test_request_stream_yields_text(self):
+        """Test that iterating the stream produces the response text."""
+        model = ClaudeCodeModel()
+
+        with patch.object(model._client, 'simple_query', new_callable=AsyncMock) as mock_query:
+            mock_query.return_value = "Streamed response"
+
+            messages = [
+                ModelRequest(
+                    parts=[TextPart(content="Test")],
+                    kind="request"
+                )
+            ]
+
+            async with model.request_stream(messages, None, ModelRequestParameters()) as stream:
+                events = [event async for event in stream]
+                response = stream.get()
+
+        assert events
+        assert response.parts[0].content == "Streamed response"
+
 
 class TestToolConversion:
     """Test tool conversion to client format."""
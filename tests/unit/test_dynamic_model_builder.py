@@ -70,6 +70,18 @@ class TestSchemaTypeConversion:
         result = DynamicModelBuilder.get_type_from_schema(schema)
         assert result == str
 
+    def test_get_type_from_schema_type_list_defaults_to_string(self):
+        """Test that a list of types falls back to string."""
+        schema = {"type": ["string", "null"]}
+        result = DynamicModelBuilder.get_type_from_schema(schema)
+        assert result == str
+
+    def test_get_type_from_schema_anyof_null_first(self):
+        """Test that null is detected wherever it appears in anyOf."""
+        schema = {"anyOf": [{"type": "null"}, {"type": "integer"}, {"type": "string"}]}
+        result = DynamicModelBuilder.get_type_from_schema(schema)
+        assert result == int | None
+
 
 class TestSchemaRefResolution:
     """Test JSON schema reference resolution."""
@@ -152,6 +164,115 @@ class TestSchemaRefResolution:
         assert resolved["properties"]["users"]["items"]["type"] == "object"
         assert resolved["properties"]["users"]["items"]["properties"]["name"]["type"] == "string"
 
+    def test_resolve_schema_without_defs_returned_as_is(self):
+        """Test that flat schemas skip the walk entirely."""
+        schema = {
+            "type": "object",
+            "properties": {"name": {"type": "string"}},
+            "required": ["name"]
+        }
+
+        resolved = DynamicModelBuilder.resolve_schema_refs(schema)
+
+        assert resolved is schema
+
+    def test_resolve_deeply_nested_schema(self):
+        """Test that very deep schemas resolve without hitting the recursion limit."""
+        schema = {"$ref": "#/$defs/Leaf"}
+        for _ in range(2000):
+            schema = {"type": "object", "properties": {"child": schema}}
+        schema["$defs"] = {"Leaf": {"type": "string"}}
+
+        resolved = DynamicModelBuilder.resolve_schema_refs(schema)
+
+        node = resolved
+        for _ in range(2000):
+            node = node["properties"]["child"]
+        assert node == {"type": "string"}
+
+    def test_resolve_does_not_mutate_input(self):
+        """Test that resolving refs leaves the original schema untouched."""
+        schema = {
+            "type": "object",
+            "properties": {"user": {"$ref": "#/$defs/User"}},
+            "$defs": {"User": {"type": "object", "properties": {"name": {"type": "string"}}}}
+        }
+
+        resolved = DynamicModelBuilder.resolve_schema_refs(schema)
+
+        assert "$defs" not in resolved
+        assert "$defs" in schema
+        assert schema["properties"]["user"] == {"$ref": "#/$defs/User"}
+
+    def test_resolve_repeated_refs_resolved_once(self):
+        """Test that a definition used several times is resolved once and shared."""
+        schema = {
+            "type": "object",
+            "properties": {
+                "home": {"$ref": "#/$defs/Address"},
+                "work": {"$ref": "#/$defs/Address"},
+                "history": {"type": "array", "items": {"$ref": "#/$defs/Address"}}
+            },
+            "$defs": {
+                "Address": {
+                    "type": "object",
+                    "properties": {"city": {"type": "string"}}
+                }
+            }
+        }
+
+        resolved = DynamicModelBuilder.resolve_schema_refs(schema)
+
+        home = resolved["properties"]["home"]
+        assert home["properties"]["city"]["type"] == "string"
+        assert resolved["properties"]["work"] is home
+        assert resolved["properties"]["history"]["items"] is home
+
+    def test_resolve_ref_outside_defs(self):
+        """Test that local refs not in the '#/$defs/<Name>' form still resolve."""
+        schema = {
+            "type": "object",
+            "properties": {"user": {"$ref": "#/definitions/User"}},
+            "definitions": {"User": {"type": "object", "properties": {"name": {"type": "string"}}}}
+        }
+
+        resolved = DynamicModelBuilder.resolve_schema_refs(schema)
+
+        assert resolved["properties"]["user"]["properties"]["name"]["type"] == "string"
+
+    def test_resolve_shares_ref_free_subtrees(self):
+        """Test that subtrees without any $ref are reused rather than copied."""
+        schema = {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "examples": ["Alice"]},
+                "user": {"$ref": "#/$defs/User"}
+            },
+            "$defs": {"User": {"type": "object", "properties": {"email": {"type": "string"}}}}
+        }
+
+        resolved = DynamicModelBuilder.resolve_schema_refs(schema)
+
+        assert resolved["properties"] is not schema["properties"]
+        assert resolved["properties"]["name"] is schema["properties"]["name"]
+        assert resolved["properties"]["user"] is schema["$defs"]["User"]
+
+    def test_resolve_recursive_ref_raises(self):
+        """Test that self-referencing schemas are rejected instead of looping."""
+        schema = {
+            "type": "object",
+            "properties": {"root": {"$ref": "#/$defs/Node"}},
+            "$defs": {
+                "Node": {
+                    "type": "object",
+                    "properties": {"child": {"$ref": "#/$defs/Node"}}
+                }
+            }
+        }
+
+        with pytest.raises(ValueError, match="Recursive \\$ref"):
+            DynamicModelBuilder.resolve_schema_refs(schema)
+
 
 class TestModelCreation:
     """Test dynamic Pydantic model creation."""
@@ -236,6 +357,40 @@ class TestModelCreation:
         assert instance.user["name"] == "Alice"
         assert instance.user["email"] == "alice@example.com"
 
+    def test_create_model_is_cached_per_schema(self):
+        """Test that equal schemas reuse the same model class and different ones don't."""
+        def make_schema(field_type):
+            return {
+                "type": "object",
+                "title": "CachedModel",
+                "properties": {"value": {"type": field_type}},
+                "required": ["value"]
+            }
+
+        first = DynamicModelBuilder.create_model_from_schema(make_schema("string"))
+        second = DynamicModelBuilder.create_model_from_schema(make_schema("string"))
+        other = DynamicModelBuilder.create_model_from_schema(make_schema("integer"))
+
+        assert first is second
+        assert other is not first
+        assert other(value=3).value == 3
+
+    def test_create_model_preserves_field_order(self):
+        """Test that cached models keep the schema's property order."""
+        schema = {
+            "type": "object",
+            "title": "OrderedModel",
+            "properties": {
+                "zeta": {"type": "string"},
+                "alpha": {"type": "string"}
+            },
+            "required": ["zeta", "alpha"]
+        }
+
+        Model = DynamicModelBuilder.create_model_from_schema(schema)
+
+        assert list(Model.model_fields) == ["zeta", "alpha"]
+
 
 class TestPostProcessing:
     """Test model data post-processing."""
@@ -324,3 +479,25 @@ class TestPostProcessing:
 
         # Post-processing only handles top-level None values, not nested ones
         assert processed["data"]["items"] is None
+
+    def test_fill_empty_containers_with_cached_field_names(self):
+        """Test filling containers using the field names cached with the model."""
+        schema = {
+            "type": "object",
+            "title": "ContainerModel",
+            "properties": {
+                "name": {"type": "string"},
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "meta": {"type": "object"}
+            },
+            "required": ["name"]
+        }
+        data = {"name": None, "tags": None, "meta": None}
+
+        _, list_fields, dict_fields = DynamicModelBuilder.create_model_with_container_fields(schema)
+        filled = DynamicModelBuilder.fill_empty_containers(data, list_fields, dict_fields)
+
+        assert list_fields == ("tags",)
+        assert dict_fields == ("meta",)
+        assert filled == {"name": None, "tags": [], "meta": {}}
+        assert data["tags"] is None
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import pytest
 from pathlib import Path
@@ -57,6 +58,24 @@ class TestBase64ImageProcessing:
         assert filepath is not None
         assert Path(filepath).suffix == ".jpeg"
 
+    def test_repeated_saves_use_unique_filenames(self, test_workspace):
+        """Test that back-to-back saves never reuse a filename."""
+        handler = MultimodalContentHandler(test_workspace)
+
+        image_block = {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": "image/png",
+                "data": base64.b64encode(b"same image").decode()
+            }
+        }
+
+        filepaths = [handler._save_image_to_file(image_block) for _ in range(5)]
+
+        assert len(set(filepaths)) == 5
+        assert all(Path(fp).exists() for fp in filepaths)
+
     def test_url_image_returns_none(self, test_workspace):
         """Test that URL images return None (no temp file needed)."""
         handler = MultimodalContentHandler(test_workspace)
@@ -214,6 +233,93 @@ class TestContextManager:
             assert len(temp_files) == 0
 
 
+class TestAsyncContentProcessing:
+    """Test concurrent image writing."""
+
+    @staticmethod
+    def _image_block(data: bytes) -> dict:
+        return {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": "image/png",
+                "data": base64.b64encode(data).decode()
+            }
+        }
+
+    @pytest.mark.asyncio
+    async def test_process_multiple_images_preserves_order(self, test_workspace):
+        """Test that concurrently written images keep their prompt positions."""
+        handler = MultimodalContentHandler(test_workspace)
+
+        content = [
+            {"type": "text", "text": "First"},
+            self._image_block(b"image one"),
+            {"type": "text", "text": "Second"},
+            self._image_block(b"image two"),
+        ]
+
+        prompt, temp_files = await handler.process_content_blocks_async(content)
+
+        assert len(temp_files) == 2
+        assert len(set(temp_files)) == 2
+        assert Path(temp_files[0]).read_bytes() == b"image one"
+        assert Path(temp_files[1]).read_bytes() == b"image two"
+        assert prompt.index("First") < prompt.index(temp_files[0]) < prompt.index("Second") < prompt.index(temp_files[1])
+
+    @pytest.mark.asyncio
+    async def test_process_async_matches_sync_for_text(self, test_workspace):
+        """Test that the async variant passes plain strings through unchanged."""
+        handler = MultimodalContentHandler(test_workspace)
+
+        prompt, temp_files = await handler.process_content_blocks_async("Hello")
+
+        assert prompt == "Hello"
+        assert temp_files == []
+
+    @pytest.mark.asyncio
+    async def test_failed_image_cleans_up_written_files(self, workspace_subdir):
+        """Test that a failing image write removes the images already written."""
+        handler = MultimodalContentHandler(workspace_subdir)
+
+        bad_block = {"type": "image", "source": {"type": "unsupported"}}
+        content = [self._image_block(b"good image"), bad_block]
+
+        with pytest.raises(ValueError, match="Unsupported image source type"):
+            await handler.process_content_blocks_async(content)
+
+        assert list(workspace_subdir.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_managed_content_async_cleans_up(self, test_workspace):
+        """Test that managed_content_async removes temp files on exit."""
+        handler = MultimodalContentHandler(test_workspace)
+
+        async with handler.managed_content_async([self._image_block(b"data")]) as (prompt, temp_files):
+            assert len(temp_files) == 1
+            temp_file_path = temp_files[0]
+            assert Path(temp_file_path).exists()
+
+        # Cleanup runs in the background after a successful exit
+        for _ in range(100):
+            if not Path(temp_file_path).exists():
+                break
+            await asyncio.sleep(0.01)
+        assert not Path(temp_file_path).exists()
+
+    @pytest.mark.asyncio
+    async def test_managed_content_async_cleans_up_on_error(self, test_workspace):
+        """Test that managed_content_async removes temp files before re-raising."""
+        handler = MultimodalContentHandler(test_workspace)
+
+        with pytest.raises(ValueError, match="Test error"):
+            async with handler.managed_content_async([self._image_block(b"data")]) as (prompt, temp_files):
+                temp_file_path = temp_files[0]
+                raise ValueError("Test error")
+
+        assert not Path(temp_file_path).exists()
+
+
 class TestErrorHandling:
     """Test error handling in multimodal handler."""
 
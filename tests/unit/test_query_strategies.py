@@ -0,0 +1,140 @@
+"""Unit tests for query strategies - testing response collection and parsing helpers."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from pydantic import BaseModel, ValidationError
+
+from clowclow.query_strategies import QueryStrategy, StructuredQueryStrategy
+
+
+class _FakeSDKClient:
+    """Minimal stand-in for ClaudeSDKClient that replays canned messages."""
+
+    def __init__(self, messages: list):
+        self._messages = messages
+
+    async def receive_response(self):
+        for message in self._messages:
+            yield message
+
+
+class TestResponseCollection:
+    """Test collecting text from streamed SDK messages."""
+
+    @pytest.mark.asyncio
+    async def test_collects_text_blocks_in_order(self):
+        """Test that text blocks across messages are concatenated in order."""
+        client = _FakeSDKClient([
+            SimpleNamespace(content=[SimpleNamespace(text="Hello, ")]),
+            SimpleNamespace(content=[SimpleNamespace(text="world"), SimpleNamespace(text="!")]),
+        ])
+
+        result = await QueryStrategy._collect_response_text(client)
+
+        assert result == "Hello, world!"
+
+    @pytest.mark.asyncio
+    async def test_skips_messages_and_blocks_without_text(self):
+        """Test that non-content messages and non-text blocks are ignored."""
+        client = _FakeSDKClient([
+            SimpleNamespace(subtype="init"),
+            SimpleNamespace(content=[SimpleNamespace(name="Read", input={}), SimpleNamespace(text="Done")]),
+            SimpleNamespace(content=[]),
+        ])
+
+        result = await QueryStrategy._collect_response_text(client)
+
+        assert result == "Done"
+
+
+class TestJsonExtraction:
+    """Test JSON extraction from Claude responses."""
+
+    def test_extract_plain_json(self):
+        """Test that a pure JSON response is returned as text for direct validation."""
+        text = '  {"name": "Alice", "age": 30}\n'
+
+        result = StructuredQueryStrategy._extract_json_from_response(text)
+
+        assert result == '{"name": "Alice", "age": 30}'
+
+    def test_extract_fenced_json(self):
+        """Test extracting JSON wrapped in a ```json fence."""
+        text = 'Here you go:\n```json\n{"name": "Alice"}\n```\nThanks!'
+
+        result = StructuredQueryStrategy._extract_json_from_response(text)
+
+        assert result == '{"name": "Alice"}'
+
+    def test_extract_json_with_surrounding_text(self):
+        """Test extracting JSON embedded in prose."""
+        text = 'Sure! {"user": {"name": "Alice"}} Let me know if you need more.'
+
+        result = StructuredQueryStrategy._extract_json_from_response(text)
+
+        assert result == {"user": {"name": "Alice"}}
+
+    def test_extract_json_with_braces_in_strings(self):
+        """Test that braces inside string values don't break extraction."""
+        text = 'Result: {"pattern": "}{", "nested": {"note": "a } b"}} done'
+
+        result = StructuredQueryStrategy._extract_json_from_response(text)
+
+        assert result == {"pattern": "}{", "nested": {"note": "a } b"}}
+
+    def test_extract_json_after_leading_array(self):
+        """Test that a leading non-object value falls through to object search."""
+        text = '[1, 2] then {"name": "Alice"}'
+
+        result = StructuredQueryStrategy._extract_json_from_response(text)
+
+        assert result == {"name": "Alice"}
+
+    def test_extract_no_json_raises(self):
+        """Test that a response without JSON raises ValueError."""
+        with pytest.raises(ValueError, match="No JSON object found"):
+            StructuredQueryStrategy._extract_json_from_response("No JSON here")
+
+    def test_extract_truncated_json_raises(self):
+        """Test that an unterminated JSON object raises ValueError."""
+        with pytest.raises(ValueError):
+            StructuredQueryStrategy._extract_json_from_response('{"name": "Alice"')
+
+
+class TestResponseParsing:
+    """Test validating extracted JSON into Pydantic models."""
+
+    class Person(BaseModel):
+        name: str
+        age: int
+
+    def test_parse_plain_json(self):
+        """Test parsing a bare JSON response."""
+        result = StructuredQueryStrategy._parse_response('{"name": "Alice", "age": 30}', self.Person)
+
+        assert result == self.Person(name="Alice", age=30)
+
+    def test_parse_json_embedded_in_prose(self):
+        """Test parsing JSON surrounded by explanatory text."""
+        text = 'Here it is: {"name": "Bob", "age": 41} - hope that helps!'
+
+        result = StructuredQueryStrategy._parse_response(text, self.Person)
+
+        assert result == self.Person(name="Bob", age=41)
+
+    def test_parse_falls_back_when_text_only_looks_like_json(self):
+        """Test that text starting and ending with braces but holding more than one object still parses."""
+        text = '{"name": "Carol", "age": 25}\n\nNote: fields use {braces}'
+
+        result = StructuredQueryStrategy._parse_response(text, self.Person)
+
+        assert result == self.Person(name="Carol", age=25)
+
+    def test_parse_schema_mismatch_raises_validation_error(self):
+        """Test that valid JSON not matching the model raises ValidationError."""
+        with pytest.raises(ValidationError):
+            StructuredQueryStrategy._parse_response('{"name": "Dave"}', self.Person)
@@ -2,17 +2,21 @@
 
 from __future__ import annotations
 
+import gc
+
 import pytest
 from pydantic_ai.messages import (
     ModelRequest,
+    ModelResponse,
     UserPromptPart,
     TextPart,
     BinaryContent,
     ImageUrl,
+    SystemPromptPart,
     ToolReturnPart,
 )
 
-from clowclow.request_handler import RequestHandler
+from clowclow.request_handler import _BASE64_CACHE, RequestHandler
 
 
 class TestMessageExtraction:
@@ -62,8 +66,44 @@ class TestMessageExtraction:
         ]
 
         system_msg = RequestHandler.extract_system_messages(messages)
-        assert "System instruction 1" in system_msg
-        assert "System instruction 2" in system_msg
+        assert system_msg == "System instruction 2"
+
+    def test_extract_system_messages_keeps_first_turn_system_prompt(self):
+        """Test that system prompt parts from earlier turns are combined with the latest instructions."""
+        messages = [
+            ModelRequest(
+                parts=[SystemPromptPart(content="System prompt"), UserPromptPart(content="Hi")],
+                kind="request",
+                instructions="Instructions"
+            ),
+            ModelResponse(parts=[TextPart(content="Hello")]),
+            ModelRequest(
+                parts=[UserPromptPart(content="Again")],
+                kind="request",
+                instructions="Instructions"
+            )
+        ]
+
+        system_msg = RequestHandler.extract_system_messages(messages)
+        assert system_msg == "System prompt\nInstructions"
+
+    def test_extract_system_messages_keeps_message_order(self):
+        """Test that instructions keep their place relative to system prompt parts."""
+        messages = [
+            ModelRequest(
+                parts=[SystemPromptPart(content="First turn prompt"), UserPromptPart(content="Hi")],
+                kind="request"
+            ),
+            ModelResponse(parts=[TextPart(content="Hello")]),
+            ModelRequest(
+                parts=[SystemPromptPart(content="Second turn prompt"), UserPromptPart(content="Again")],
+                kind="request",
+                instructions="Instructions"
+            )
+        ]
+
+        system_msg = RequestHandler.extract_system_messages(messages)
+        assert system_msg == "First turn prompt\nInstructions\nSecond turn prompt"
 
 
 class TestImageDetection:
@@ -110,6 +150,23 @@ class TestImageDetection:
         ]
         assert RequestHandler.has_images(messages) is True
 
+    def test_has_images_detects_subclassed_image_parts(self):
+        """Test that has_images agrees with extract_content on subclassed image parts."""
+        class CustomImageUrl(ImageUrl):
+            pass
+
+        messages = [
+            ModelRequest(
+                parts=[CustomImageUrl(url="https://example.com/image.png")],
+                kind="request"
+            ),
+            ModelResponse(parts=[TextPart(content="A cat")]),
+            ModelRequest(parts=[UserPromptPart(content="What color is it?")], kind="request"),
+        ]
+
+        assert RequestHandler.has_images(messages) is True
+        assert isinstance(RequestHandler.extract_content(messages), list)
+
 
 class TestMultimodalExtraction:
     """Test multimodal content extraction."""
@@ -167,6 +224,196 @@ class TestMultimodalExtraction:
         assert content[0]["source"]["type"] == "url"
         assert content[0]["source"]["url"] == "https://example.com/image.png"
 
+    def test_extract_multimodal_handles_subclasses_and_skips_unknown_parts(self):
+        """Test that subclassed items still dispatch and unhandled parts are skipped."""
+        class Caption(str):
+            pass
+
+        messages = [
+            ModelRequest(
+                parts=[
+                    SystemPromptPart(content="Be brief"),
+                    UserPromptPart(content=[
+                        Caption("A caption"),
+                        {"type": "text", "text": "Raw block"},
+                        ImageUrl(url="https://example.com/image.png")
+                    ])
+                ],
+                kind="request"
+            )
+        ]
+        part_table = dict(RequestHandler._PART_HANDLERS)
+        item_table = dict(RequestHandler._ITEM_HANDLERS)
+
+        content = RequestHandler.extract_multimodal_content(messages)
+
+        assert content == [
+            {"type": "text", "text": "A caption"},
+            {"type": "text", "text": "Raw block"},
+            {"type": "image", "source": {"type": "url", "url": "https://example.com/image.png"}},
+        ]
+        # Resolving Caption and SystemPromptPart leaves the dispatch tables as they were
+        assert RequestHandler._PART_HANDLERS == part_table
+        assert RequestHandler._ITEM_HANDLERS == item_table
+
+
+class TestBinaryContentEncoding:
+    """Test base64 encoding of binary image content."""
+
+    def test_binary_content_is_base64_encoded(self):
+        """Test that bytes are encoded to base64 text."""
+        block = RequestHandler._binary_content_to_dict(BinaryContent(data=b"\x89PNG", media_type="image/png"))
+
+        assert block["source"] == {"type": "base64", "media_type": "image/png", "data": "iVBORw=="}
+
+    def test_repeated_image_reuses_encoding(self):
+        """Test that resending the same image part reuses the encoded string."""
+        part = BinaryContent(data=bytes(range(256)) * 64, media_type="image/png")
+
+        first = RequestHandler._binary_content_to_dict(part)
+        second = RequestHandler._binary_content_to_dict(part)
+
+        assert second["source"]["data"] is first["source"]["data"]
+
+    def test_cached_encoding_released_with_part(self):
+        """Test that a cached encoding doesn't outlive its image part."""
+        part = BinaryContent(data=bytes(range(256)) * 64, media_type="image/png")
+        key = id(part)
+        RequestHandler._binary_content_to_dict(part)
+        assert key in _BASE64_CACHE
+
+        del part
+        gc.collect()
+
+        assert key not in _BASE64_CACHE
+
+    def test_reassigned_image_data_is_reencoded(self):
+        """Test that replacing a part's bytes doesn't return the old encoding."""
+        part = BinaryContent(data=b"\x89PNG", media_type="image/png")
+        RequestHandler._binary_content_to_dict(part)
+
+        part.data = b"GIF8"
+        block = RequestHandler._binary_content_to_dict(part)
+
+        assert block["source"]["data"] == "R0lGOA=="
+
+
+class TestContentExtraction:
+    """Test single-pass content extraction."""
+
+    def test_extract_content_text_matches_extract_user_message(self):
+        """Test that text-only messages give the same string as extract_user_message."""
+        messages = [
+            ModelRequest(parts=[UserPromptPart(content="What is 2+2?")], kind="request"),
+            ModelResponse(parts=[TextPart(content="4")]),
+            ModelRequest(
+                parts=[UserPromptPart(content="And 3+3?"), TextPart(content="Be brief")],
+                kind="request"
+            )
+        ]
+
+        content = RequestHandler.extract_content(messages)
+
+        assert content == RequestHandler.extract_user_message(messages)
+        assert content.endswith("And 3+3?\nBe brief")
+
+    def test_extract_content_with_image_returns_blocks(self):
+        """Test that an image in the latest request gives multimodal blocks."""
+        messages = [
+            ModelRequest(
+                parts=[
+                    TextPart(content="Look at this"),
+                    BinaryContent(data=b"\x89PNG", media_type="image/png")
+                ],
+                kind="request"
+            )
+        ]
+
+        content = RequestHandler.extract_content(messages)
+
+        assert content == RequestHandler.extract_multimodal_content(messages)
+
+    def test_extract_content_with_image_in_earlier_request_returns_blocks(self):
+        """Test that an image earlier in the history still selects multimodal blocks."""
+        messages = [
+            ModelRequest(parts=[ImageUrl(url="https://example.com/image.png")], kind="request"),
+            ModelResponse(parts=[TextPart(content="A cat")]),
+            ModelRequest(parts=[UserPromptPart(content="What color is it?")], kind="request")
+        ]
+
+        content = RequestHandler.extract_content(messages)
+
+        assert isinstance(content, list)
+        assert content == RequestHandler.extract_multimodal_content(messages)
+
+    def test_extract_content_single_prompt(self):
+        """Test that a lone text prompt is returned as-is."""
+        messages = [ModelRequest(parts=[UserPromptPart(content="Hello")], kind="request")]
+
+        assert RequestHandler.extract_content(messages) == "Hello"
+
+    def test_extract_content_single_list_prompt_is_multimodal(self):
+        """Test that a lone prompt with list content still gives content blocks."""
+        messages = [ModelRequest(parts=[UserPromptPart(content=["Hello"])], kind="request")]
+
+        assert RequestHandler.extract_content(messages) == [{"type": "text", "text": "Hello"}]
+
+    def test_extract_content_without_requests(self):
+        """Test that messages without any request give an empty string."""
+        assert RequestHandler.extract_content([]) == ""
+
+
+class TestConversationHistory:
+    """Test how previous turns are flattened into the prompt."""
+
+    @staticmethod
+    def _conversation(turns: int) -> list:
+        """Build a conversation with `turns` answered exchanges and a new question."""
+        messages = []
+        for i in range(turns):
+            messages.append(ModelRequest(parts=[UserPromptPart(content=f"Question {i}")], kind="request"))
+            messages.append(ModelResponse(parts=[TextPart(content=f"Answer {i}")]))
+        messages.append(ModelRequest(parts=[UserPromptPart(content=f"Question {turns}")], kind="request"))
+        return messages
+
+    def test_history_grows_by_appending(self):
+        """Test that each turn's history is a prefix of the next turn's history."""
+        histories = [
+            RequestHandler.extract_conversation_history(self._conversation(turns))
+            for turns in range(1, 5)
+        ]
+
+        for earlier, later in zip(histories, histories[1:]):
+            assert later.startswith(earlier)
+
+    def test_history_limit_keeps_most_recent_messages(self):
+        """Test that history_limit drops the oldest messages from the history."""
+        messages = self._conversation(3)
+
+        history = RequestHandler.extract_conversation_history(messages, history_limit=3)
+
+        assert history == "Assistant: Answer 1\n\nUser: Question 2\n\nAssistant: Answer 2"
+        assert RequestHandler.extract_content(messages, history_limit=3) == f"{history}\n\nQuestion 3"
+
+    def test_history_limit_zero_sends_no_history(self):
+        """Test that a history_limit of 0 sends only the current prompt."""
+        messages = self._conversation(2)
+
+        assert RequestHandler.extract_content(messages, history_limit=0) == "Question 2"
+
+    def test_prompt_ignores_timestamps(self):
+        """Test that message timestamps don't leak into the flattened prompt."""
+        first = self._conversation(2)
+        second = self._conversation(2)
+        for message in second:
+            if isinstance(message, ModelResponse):
+                message.timestamp = message.timestamp.replace(year=2000)
+            else:
+                for part in message.parts:
+                    part.timestamp = part.timestamp.replace(year=2000)
+
+        assert RequestHandler.extract_content(first) == RequestHandler.extract_content(second)
+
 
 class TestEdgeCases:
     """Test edge cases in message extraction logic."""